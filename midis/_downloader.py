@@ -0,0 +1,134 @@
+"""Shared async HTTP helpers for the midiworld.com MIDI download scripts."""
+
+import asyncio
+import email.utils
+import json
+import os
+import time
+
+import aiohttp
+
+# Base URL for midiworld.com
+MIDIWORLD_BASE = "https://www.midiworld.com/midis/other/"
+
+# In-flight downloads (matches the connector limit) and overall request rate
+MAX_CONCURRENCY = 16
+REQUESTS_PER_SECOND = 10
+
+# Download manifest: sections of {"folder", "note", "files"} entries
+MANIFEST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'midis.json')
+
+HEADERS = {'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'}
+
+
+def load_tasks(section, manifest_path=MANIFEST_PATH):
+    """Return deduplicated (url, filepath) pairs for one manifest section.
+
+    Sections are walked in file order, so an entry already listed by an
+    earlier section is not downloaded again. Two different URLs that would
+    save to the same local file are reported and only the first is kept.
+    """
+    with open(manifest_path, encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    seen_urls = set()
+    owners = {}
+    tasks = []
+    for name, entries in manifest.items():
+        for entry in entries:
+            folder = entry['folder']
+            # Composer prefix avoids collisions between folders
+            composer = folder.rstrip("/")
+            for filename in entry['files']:
+                url = MIDIWORLD_BASE + folder + filename
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                filepath = f"{composer}_{filename.replace('/', '_')}"
+                if filepath in owners:
+                    print(f"! {filepath}: {url} collides with {owners[filepath]}, skipping")
+                    continue
+                owners[filepath] = url
+                if name == section:
+                    tasks.append((url, filepath))
+    return tasks
+
+
+class RateLimiter:
+    """Token bucket for coroutines; waiting for a slot doesn't block other downloads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_slot = time.monotonic()
+
+    async def wait(self):
+        now = time.monotonic()
+        slot = max(self.next_slot, now)
+        self.next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+def create_session():
+    """Create a session whose single connector keeps connections to midiworld.com alive.
+
+    Certificates aren't verified, for older sites.
+    """
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, ssl=False)
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=HEADERS,
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+
+
+async def download_file(session, url, filepath):
+    """Download a file from URL to filepath.
+
+    If filepath already exists a conditional request is made using its mtime,
+    and a 304 Not Modified counts as success without touching the file.
+    """
+    headers = None
+    if os.path.exists(filepath):
+        since = email.utils.formatdate(os.path.getmtime(filepath), usegmt=True)
+        headers = {'If-Modified-Since': since}
+
+    # Stream into a .part file and rename on success so an interrupted
+    # download never leaves a truncated file that looks complete
+    part_path = filepath + '.part'
+    try:
+        async with session.get(url, headers=headers) as resp:
+            if resp.status == 304:
+                return True
+            if resp.status != 200:
+                return False
+            with open(part_path, 'wb') as f:
+                async for chunk in resp.content.iter_chunked(65536):
+                    f.write(chunk)
+            last_modified = resp.headers.get('Last-Modified')
+        os.replace(part_path, filepath)
+        # Mirror the server's Last-Modified so the next conditional request is accurate
+        if last_modified:
+            mtime = email.utils.parsedate_to_datetime(last_modified).timestamp()
+            os.utime(filepath, (time.time(), mtime))
+        return True
+    except Exception:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        return False
+
+
+async def download_all(tasks, on_done):
+    """Download (url, filepath) tasks concurrently, calling on_done(filepath, ok) for each."""
+    limiter = RateLimiter(REQUESTS_PER_SECOND)
+    semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+    async with create_session() as session:
+        async def fetch(url, filepath):
+            # Shared rate limit keeps us respectful; the semaphore caps in-flight requests
+            await limiter.wait()
+            async with semaphore:
+                ok = await download_file(session, url, filepath)
+            on_done(filepath, ok)
+
+        await asyncio.gather(*(fetch(url, filepath) for url, filepath in tasks))
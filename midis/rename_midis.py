@@ -4,8 +4,11 @@ Rename MIDI files to {artist}-{broad_style}-{piecename}.mid format
 Based on known composer catalogs and style classifications
 """
 
+import ctypes
+import errno
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Composer style mappings
 COMPOSER_STYLES = {
@@ -413,80 +416,155 @@ CHOPIN_PIECES = {
     'scherzo3': 'scherzo3', 'scherzo4': 'scherzo4',
 }
 
+# Direct filename lookups from both tables, with the .mid suffix pre-applied
+assert not NAMED_PIECES.keys() & C_PREFIX_MAPPINGS.keys()
+DIRECT_NAMES = {base: name + '.mid' for base, name in {**NAMED_PIECES, **C_PREFIX_MAPPINGS}.items()}
+
+# Anchored dispatcher for the Bach BWV and c1_/c2_/c3_ compilation names
+DISPATCH_RE = re.compile(r'(?:(?P<bwv>bach_bwv)|(?P<cprefix>c[123]_))')
+
+# Composer names contain no '_', so the token before the first '_' identifies
+# the composer with a single set lookup
+COMPOSER_SET = frozenset(COMPOSER_STYLES)
+
 def get_new_name(filename):
     """Generate new name in {artist}-{style}-{piecename}.mid format"""
     base = filename.replace('.mid', '')
     
     # Check direct mappings first
-    if base in NAMED_PIECES:
-        return NAMED_PIECES[base] + '.mid'
-    if base in C_PREFIX_MAPPINGS:
-        return C_PREFIX_MAPPINGS[base] + '.mid'
+    direct = DIRECT_NAMES.get(base)
+    if direct is not None:
+        return direct
     
-    # Handle Bach BWV numbers
-    if base.startswith('bach_bwv'):
-        bwv = base.replace('bach_bwv', '')
-        if bwv in BACH_BWV_NAMES:
-            return f"bach-baroque-{BACH_BWV_NAMES[bwv]}.mid"
-        return f"bach-baroque-bwv{bwv}.mid"
+    m = DISPATCH_RE.match(base)
+    if m is not None:
+        # Handle Bach BWV numbers
+        if m.group('bwv'):
+            bwv = base[m.end():]
+            if bwv in BACH_BWV_NAMES:
+                return f"bach-baroque-{BACH_BWV_NAMES[bwv]}.mid"
+            return f"bach-baroque-bwv{bwv}.mid"
+        
+        # Handle c1_, c2_, c3_ prefix files not in mapping
+        return f"various-classical-{base}.mid"
     
     # Handle composer_piece format
-    for composer in COMPOSER_STYLES:
-        if base.startswith(composer + '_'):
-            piece = base.replace(composer + '_', '')
-            style = COMPOSER_STYLES[composer]
+    composer, sep, piece = base.partition('_')
+    if sep and composer in COMPOSER_SET:
+        style = COMPOSER_STYLES[composer]
+        
+        # Check composer-specific mappings
+        if composer == 'beethoven' and piece in BEETHOVEN_PIECES:
+            piece = BEETHOVEN_PIECES[piece]
+        elif composer == 'mozart' and piece in MOZART_PIECES:
+            piece = MOZART_PIECES[piece]
+        elif composer == 'chopin':
+            if piece in CHOPIN_PIECES:
+                piece = CHOPIN_PIECES[piece]
+            # Handle numbered pieces (etude1, prelude1, etc.)
             
-            # Check composer-specific mappings
-            if composer == 'beethoven' and piece in BEETHOVEN_PIECES:
-                piece = BEETHOVEN_PIECES[piece]
-            elif composer == 'mozart' and piece in MOZART_PIECES:
-                piece = MOZART_PIECES[piece]
-            elif composer == 'chopin':
-                if piece in CHOPIN_PIECES:
-                    piece = CHOPIN_PIECES[piece]
-                # Handle numbered pieces (etude1, prelude1, etc.)
-                
-            return f"{composer}-{style}-{piece}.mid"
-    
-    # Handle c1_, c2_, c3_ prefix files not in mapping
-    if base.startswith('c1_') or base.startswith('c2_') or base.startswith('c3_'):
-        return f"various-classical-{base}.mid"
+        return f"{composer}-{style}-{piece}.mid"
     
     # Default fallback
     return f"unknown-classical-{base}.mid"
 
+# Files already in {artist}-{style}-{piece}.mid form are left alone
+ALREADY_RENAMED_RE = re.compile(
+    r'(?:bach|beethoven|mozart|chopin|handel|vivaldi|debussy|schumann|dvorak|faure'
+    r'|prokofiev|poulenc|smetana|grieg|satie|ravel|various|unknown)-'
+)
+
+# Linux renameat2() flag: fail with EEXIST instead of replacing the target,
+# so the duplicate check needs no separate stat call
+RENAME_NOREPLACE = 1
+_renameat2 = getattr(ctypes.CDLL(None, use_errno=True), 'renameat2', None)
+
+def rename_noreplace(dir_fd, src, dst):
+    """Rename src to dst within dir_fd, raising FileExistsError if dst exists."""
+    if _renameat2 is not None:
+        if _renameat2(dir_fd, os.fsencode(src), dir_fd, os.fsencode(dst), RENAME_NOREPLACE) == 0:
+            return
+        err = ctypes.get_errno()
+        # Filesystems without RENAME_NOREPLACE support fall back to check-then-rename
+        if err not in (errno.EINVAL, errno.ENOSYS):
+            raise OSError(err, os.strerror(err), dst)
+    try:
+        os.stat(dst, dir_fd=dir_fd)
+    except FileNotFoundError:
+        os.rename(src, dst, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+    else:
+        raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), dst)
+
+def plan_renames(filenames, existing):
+    """Pick a unique target name for every file, resolving duplicates up front.
+    
+    A file may take the name of one planned earlier that moves out of the
+    way, as in a one-by-one rename. Plans are returned in stages: every
+    rename in a stage only needs the renames of earlier stages done first.
+    """
+    taken = set(existing)
+    # Stage of the plan moving each source name away
+    freed_by = {}
+    stages = []
+    for filename in filenames:
+        new_name = get_new_name(filename)
+        if new_name == filename:
+            continue
+        
+        # Handle duplicates
+        base, ext = os.path.splitext(new_name)
+        counter = 2
+        while new_name in taken:
+            new_name = f"{base}_v{counter}{ext}"
+            counter += 1
+        taken.discard(filename)
+        taken.add(new_name)
+        stage = freed_by[new_name] + 1 if new_name in freed_by else 0
+        freed_by[filename] = stage
+        if stage == len(stages):
+            stages.append([])
+        stages[stage].append((filename, new_name))
+    return stages
+
 def main():
     """Rename all MIDI files in current directory"""
     midi_dir = os.path.dirname(os.path.abspath(__file__))
+    # Resolve the directory once; renames are then relative to this fd
+    dir_fd = os.open(midi_dir, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
     renamed_count = 0
     
-    for filename in os.listdir(midi_dir):
-        if not filename.endswith('.mid'):
-            continue
-        if filename.startswith(('bach-', 'beethoven-', 'mozart-', 'chopin-', 
-                                'handel-', 'vivaldi-', 'debussy-', 'schumann-',
-                                'dvorak-', 'faure-', 'prokofiev-', 'poulenc-',
-                                'smetana-', 'grieg-', 'satie-', 'ravel-',
-                                'various-', 'unknown-')):
-            continue  # Already renamed
-            
-        new_name = get_new_name(filename)
-        if new_name != filename:
-            old_path = os.path.join(midi_dir, filename)
-            new_path = os.path.join(midi_dir, new_name)
-            
-            # Handle duplicates
-            if os.path.exists(new_path):
-                base, ext = os.path.splitext(new_name)
-                counter = 2
-                while os.path.exists(new_path):
-                    new_path = os.path.join(midi_dir, f"{base}_v{counter}{ext}")
-                    counter += 1
-                new_name = os.path.basename(new_path)
-            
-            print(f"{filename} -> {new_name}")
-            os.rename(old_path, new_path)
-            renamed_count += 1
+    try:
+        with os.scandir(dir_fd) as entries:
+            existing = []
+            filenames = []
+            for entry in entries:
+                existing.append(entry.name)
+                if (entry.name.endswith('.mid')
+                        and not ALREADY_RENAMED_RE.match(entry.name)
+                        and entry.is_file(follow_symlinks=False)):
+                    filenames.append(entry.name)
+        
+        # Renames within a stage have distinct sources and targets, so they
+        # can overlap their metadata round-trips; a stage starts once the
+        # names it takes over have been vacated by the previous one, and
+        # rename_noreplace still refuses to clobber anything that appeared
+        with ThreadPoolExecutor(max_workers=(os.cpu_count() or 1) * 4) as executor:
+            for plans in plan_renames(filenames, existing):
+                futures = {executor.submit(rename_noreplace, dir_fd, *plan): plan for plan in plans}
+                error = None
+                for future in as_completed(futures):
+                    filename, new_name = futures[future]
+                    try:
+                        future.result()
+                    except OSError as e:
+                        error = error or e
+                        continue
+                    print(f"{filename} -> {new_name}")
+                    renamed_count += 1
+                if error is not None:
+                    raise error
+    finally:
+        os.close(dir_fd)
     
     print(f"\nRenamed {renamed_count} files")
 
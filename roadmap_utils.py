@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Line-by-line patching shared by the roadmap update scripts."""
+
+import re
+from pathlib import Path
+from typing import Callable, Iterable
+
+DONE_MARK = '✅'
+
+# A checklist item, anywhere on its line, with the task id it names
+TASK_RE = re.compile(r'- \[([ x])\] ([A-Z]\d{3}) ')
+
+
+def patch_roadmap(path: str, patch_line: Callable[[str], str]) -> None:
+    """Read a roadmap once, pass each line (newline included) through
+    patch_line, and write the result back once."""
+    roadmap = Path(path)
+    lines = re.split('(?<=\n)', roadmap.read_text())
+    roadmap.write_text(''.join(patch_line(line) for line in lines))
+
+
+def mark_tasks_done(task_ids: Iterable[str]) -> Callable[[str], str]:
+    """Line patcher that checks off the given task ids.
+
+    `- [ ] ID text.` becomes `- [x] ID text. ✅`; items already marked
+    done are left as they are.
+    """
+    task_ids = frozenset(task_ids)
+
+    def patch_line(line: str) -> str:
+        for m in TASK_RE.finditer(line):
+            if m.group(2) in task_ids:
+                break
+        else:
+            return line
+        body = line.rstrip('\n')
+        ending = line[len(body):]
+        head, text = body[:m.start()], body[m.end():]
+        if not text or text.endswith(DONE_MARK):
+            return f'{head}- [x] {m.group(2)} {text}{ending}'
+        if len(text) > 1 and text.endswith('.'):
+            text = text[:-1]
+        return f'{head}- [x] {m.group(2)} {text}. {DONE_MARK}{ending}'
+
+    return patch_line
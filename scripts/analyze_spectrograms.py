@@ -2,23 +2,53 @@
 """Generate mel-spectrogram visualizations of the rendered WAV files."""
 
 import numpy as np
+import matplotlib
+# Headless raster backend: output is only ever saved to PNG
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
+import functools
 import wave
-import struct
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# scipy's FFT can split the batched transform across all cores; fall back to
+# numpy's single-threaded FFT when scipy isn't installed
+try:
+    from scipy import fft as fft_backend
+    FFT_KWARGS = {'workers': -1}
+except ImportError:
+    fft_backend = np.fft
+    FFT_KWARGS = {}
+
+# WAV frames decoded per read when streaming
+CHUNK_FRAMES = 65536
+
+def iter_wav_chunks(wav, chunk_frames=CHUNK_FRAMES):
+    """Yield the left channel of an open 16-bit WAV as float32 blocks."""
+    n_channels = wav.getnchannels()
+    while True:
+        raw_data = wav.readframes(chunk_frames)
+        if not raw_data:
+            break
+        # View the 16-bit PCM in place and take the left channel only for mono
+        # analysis, so just that channel is cast to float32
+        samples = np.frombuffer(raw_data, dtype='<i2')
+        block = samples[::n_channels].astype(np.float32)
+        block *= 1.0 / 32768.0
+        yield block
 
 def read_wav(filepath):
     """Read a WAV file and return audio samples."""
     with wave.open(filepath, 'rb') as wav:
-        n_channels = wav.getnchannels()
         framerate = wav.getframerate()
-        n_frames = wav.getnframes()
-        raw_data = wav.readframes(n_frames)
-    
-    samples = np.array(struct.unpack(f'<{n_frames * n_channels}h', raw_data), dtype=np.float32) / 32768.0
-    # Take left channel only for mono analysis
-    audio = samples[::n_channels]
-    return audio, framerate
+        audio = np.empty(wav.getnframes(), dtype=np.float32)
+        # Decode block by block so the whole interleaved PCM payload is never
+        # held in memory alongside the float copy
+        pos = 0
+        for block in iter_wav_chunks(wav):
+            audio[pos:pos + len(block)] = block
+            pos += len(block)
+    return audio[:pos], framerate
 
 def hz_to_mel(hz):
     """Convert Hz to mel scale."""
@@ -28,8 +58,9 @@ def mel_to_hz(mel):
     """Convert mel scale to Hz."""
     return 700 * (10**(mel / 2595) - 1)
 
+@functools.lru_cache(maxsize=16)
 def get_mel_filterbank(sr, n_fft, n_mels, fmin=0, fmax=None):
-    """Create a mel filterbank."""
+    """Create a mel filterbank (cached and read-only)."""
     if fmax is None:
         fmax = sr / 2
     
@@ -37,56 +68,84 @@ def get_mel_filterbank(sr, n_fft, n_mels, fmin=0, fmax=None):
     mel_max = hz_to_mel(fmax)
     mel_points = np.linspace(mel_min, mel_max, n_mels + 2)
     hz_points = mel_to_hz(mel_points)
-    bin_points = np.floor((n_fft + 1) * hz_points / sr).astype(int)
+    bin_points = np.floor((n_fft + 1) * hz_points / sr).astype(np.int32)
     
-    filterbank = np.zeros((n_mels, n_fft // 2 + 1))
-    for i in range(n_mels):
-        for j in range(bin_points[i], bin_points[i + 1]):
-            if bin_points[i + 1] != bin_points[i]:
-                filterbank[i, j] = (j - bin_points[i]) / (bin_points[i + 1] - bin_points[i])
-        for j in range(bin_points[i + 1], bin_points[i + 2]):
-            if bin_points[i + 2] != bin_points[i + 1]:
-                filterbank[i, j] = (bin_points[i + 2] - j) / (bin_points[i + 2] - bin_points[i + 1])
+    # Build all triangles at once: each row rises over [left, center) and
+    # falls over [center, right)
+    j = np.arange(n_fft // 2 + 1)
+    left = bin_points[:-2, None]
+    center = bin_points[1:-1, None]
+    right = bin_points[2:, None]
+    rising = (j - left) / np.maximum(center - left, 1)
+    falling = (right - j) / np.maximum(right - center, 1)
+    filterbank = np.where((j >= left) & (j < center), rising, 0.0)
+    filterbank += np.where((j >= center) & (j < right), falling, 0.0)
     
+    # float32 keeps the filterbank GEMM in single precision (SGEMM)
+    filterbank = filterbank.astype(np.float32)
+    filterbank.setflags(write=False)
     return filterbank
 
+@functools.lru_cache(maxsize=16)
+def get_window(n_fft):
+    """Return a cached, read-only float32 Hann window."""
+    window = np.hanning(n_fft).astype(np.float32)
+    window.setflags(write=False)
+    return window
+
+# Frames transformed per batched FFT call; bounds the temporary frame and
+# spectrum matrices however long the input is
+FRAMES_PER_BLOCK = 1024
+
 def compute_mel_spectrogram(audio, sr, n_fft=2048, hop_length=512, n_mels=128):
-    """Compute mel spectrogram."""
-    n_frames_spec = (len(audio) - n_fft) // hop_length + 1
-    spectrogram = np.zeros((n_fft // 2 + 1, n_frames_spec))
+    """Compute mel spectrogram (float32 throughout)."""
+    audio = np.asarray(audio, dtype=np.float32)
+    window = get_window(n_fft)
+    mel_fb = get_mel_filterbank(sr, n_fft, n_mels, fmin=20, fmax=sr//2)
     
-    window = np.hanning(n_fft)
-    for i in range(n_frames_spec):
-        start = i * hop_length
-        frame = audio[start:start + n_fft] * window
-        fft = np.fft.rfft(frame)
-        spectrogram[:, i] = np.abs(fft)
+    # Strided view of every hop; nothing is copied until a block is windowed
+    all_frames = np.lib.stride_tricks.sliding_window_view(audio, n_fft)[::hop_length]
+    # Filled frame-major so each block writes a contiguous run of rows
+    mel_spec = np.empty((len(all_frames), n_mels), dtype=np.float32)
+    for start in range(0, len(all_frames), FRAMES_PER_BLOCK):
+        frames = all_frames[start:start + FRAMES_PER_BLOCK] * window
+        # numpy < 2 returns complex128 from rfft of float32; cast so the
+        # GEMM can write into the float32 output
+        spectrum = np.abs(fft_backend.rfft(frames, axis=1, **FFT_KWARGS)).astype(np.float32, copy=False)
+        np.dot(spectrum, mel_fb.T, out=mel_spec[start:start + len(frames)])
+    mel_spec = mel_spec.T
     
-    mel_fb = get_mel_filterbank(sr, n_fft, n_mels, fmin=20, fmax=sr//2)
-    mel_spec = np.dot(mel_fb, spectrogram)
-    mel_spec_db = 20 * np.log10(np.maximum(mel_spec, 1e-10))
+    # Clamp, log and scale the GEMM output in place rather than allocating a
+    # new array for each step
+    np.maximum(mel_spec, 1e-10, out=mel_spec)
+    np.log10(mel_spec, out=mel_spec)
+    mel_spec *= 20
     
-    return mel_spec_db, hop_length
+    return mel_spec, hop_length
 
 def plot_spectrogram(audio, sr, mel_spec_db, hop_length, title, output_path, annotations=None):
     """Plot mel spectrogram and waveform."""
-    fig, axes = plt.subplots(2, 1, figsize=(14, 8))
+    fig, axes = plt.subplots(2, 1, figsize=(14, 8), constrained_layout=True)
     fig.patch.set_facecolor('#1a1a2e')
     
     n_mels = mel_spec_db.shape[0]
     n_frames = mel_spec_db.shape[1]
     times = np.arange(n_frames) * hop_length / sr
     
-    # Mel spectrogram
-    im = axes[0].imshow(mel_spec_db, aspect='auto', origin='lower',
+    # Mel spectrogram, quantized from the displayed [-80, 0] dB range to uint8
+    # so the image buffer is a quarter of the float32 size
+    mel_u8 = np.clip((mel_spec_db + 80.0) * (255.0 / 80.0), 0, 255).astype(np.uint8)
+    im = axes[0].imshow(mel_u8, aspect='auto', origin='lower',
                         extent=[0, times[-1], 0, n_mels],
-                        cmap='magma', vmin=-80, vmax=0)
+                        cmap='magma', vmin=0, vmax=255, rasterized=True)
     axes[0].set_xlabel('Time (s)', color='white')
     axes[0].set_ylabel('Mel Bin', color='white')
     axes[0].set_title(title, color='white', fontsize=14)
     axes[0].tick_params(colors='white')
     axes[0].set_facecolor('#1a1a2e')
-    cbar = plt.colorbar(im, ax=axes[0])
+    db_ticks = np.arange(-80, 1, 20)
+    cbar = plt.colorbar(im, ax=axes[0], ticks=(db_ticks + 80) * (255.0 / 80.0))
+    cbar.set_ticklabels([str(t) for t in db_ticks])
     cbar.set_label('dB', color='white')
     cbar.ax.yaxis.set_tick_params(color='white')
     plt.setp(plt.getp(cbar.ax.axes, 'yticklabels'), color='white')
@@ -113,23 +172,39 @@ def plot_spectrogram(audio, sr, mel_spec_db, hop_length, title, output_path, ann
             if name:
                 axes[0].text(t + 0.05, n_mels - 10, name, color='white', fontsize=12, fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, facecolor='#1a1a2e', edgecolor='none')
-    plt.close()
+    fig.savefig(output_path, dpi=100, facecolor='#1a1a2e', edgecolor='none')
+    plt.close(fig)
     print(f'Saved: {output_path}')
 
+def analyze_file(filepath, fft_workers=-1):
+    """Read a WAV file and compute its mel spectrogram."""
+    if 'workers' in FFT_KWARGS:
+        # Only affects this (worker) process
+        FFT_KWARGS['workers'] = fft_workers
+    audio, sr = read_wav(filepath)
+    mel_spec_db, hop_length = compute_mel_spectrogram(audio, sr)
+    return audio, sr, mel_spec_db, hop_length
+
 def main():
     output_dir = 'test-output'
     
+    # The two renders share nothing, so analyze them on separate cores and
+    # split the FFT threads between them to avoid oversubscription
+    fft_workers = max(1, (os.cpu_count() or 2) // 2)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        chords_future = executor.submit(
+            analyze_file, os.path.join(output_dir, 'generated_wavetable_test.wav'), fft_workers)
+        arp_future = executor.submit(
+            analyze_file, os.path.join(output_dir, 'generated_wavetable_arpeggio.wav'), fft_workers)
+        audio, sr, mel_spec_db, hop_length = chords_future.result()
+        audio_arp, sr_arp, mel_spec_db_arp, hop_length_arp = arp_future.result()
+    
     # Process chord progression
     print("Analyzing chord progression WAV...")
-    audio, sr = read_wav(os.path.join(output_dir, 'generated_wavetable_test.wav'))
     print(f'  Sample rate: {sr} Hz')
     print(f'  Duration: {len(audio)/sr:.2f} seconds')
     print(f'  Samples: {len(audio)}')
     
-    mel_spec_db, hop_length = compute_mel_spectrogram(audio, sr)
-    
     # Chord annotations
     chord_annotations = [(0, 'C'), (1, 'F'), (2, 'G'), (3, 'C'), (4.5, '')]
     
@@ -142,15 +217,12 @@ def main():
     
     # Process arpeggio
     print("\nAnalyzing arpeggio WAV...")
-    audio_arp, sr = read_wav(os.path.join(output_dir, 'generated_wavetable_arpeggio.wav'))
-    print(f'  Sample rate: {sr} Hz')
-    print(f'  Duration: {len(audio_arp)/sr:.2f} seconds')
+    print(f'  Sample rate: {sr_arp} Hz')
+    print(f'  Duration: {len(audio_arp)/sr_arp:.2f} seconds')
     print(f'  Samples: {len(audio_arp)}')
     
-    mel_spec_db_arp, hop_length = compute_mel_spectrogram(audio_arp, sr)
-    
     plot_spectrogram(
-        audio_arp, sr, mel_spec_db_arp, hop_length,
+        audio_arp, sr_arp, mel_spec_db_arp, hop_length_arp,
         'Mel Spectrogram - Wavetable Synth Arpeggio Pattern',
         os.path.join(output_dir, 'mel_spectrogram_arpeggio.png')
     )
@@ -174,11 +246,9 @@ def main():
     # Check for harmonics (sign of a proper synthesizer)
     print("\nHarmonic content check:")
     avg_spectrum = np.mean(mel_spec_db, axis=1)
-    peaks = []
-    for i in range(1, len(avg_spectrum) - 1):
-        if avg_spectrum[i] > avg_spectrum[i-1] and avg_spectrum[i] > avg_spectrum[i+1]:
-            if avg_spectrum[i] > -60:  # Only significant peaks
-                peaks.append(i)
+    # Local maxima above -60 dB (only significant peaks)
+    inner = avg_spectrum[1:-1]
+    peaks = (np.flatnonzero((inner > avg_spectrum[:-2]) & (inner > avg_spectrum[2:]) & (inner > -60)) + 1).tolist()
     print(f"  - Significant spectral peaks: {len(peaks)}")
     print(f"  - Peak mel bins: {peaks[:10]}...")
     
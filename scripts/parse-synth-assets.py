@@ -12,24 +12,52 @@ import os
 import sys
 import json
 import gzip
+import mmap
 import struct
 import sqlite3
 import hashlib
 import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from operator import attrgetter
 import base64
 import re
 import xml.etree.ElementTree as ET
-import array
 import datetime
 
+import numpy as np
+
+# numba is optional; it JIT-compiles the 24-bit WAV decode kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# orjson is optional; it serializes the preset sections several times faster
+try:
+    import orjson
+    
+    def dumps_json(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    dumps_json = json.dumps
+
+# Precompiled struct formats for header and chunk fields
+_U16_LE = struct.Struct('<H')
+_U32_LE = struct.Struct('<I')
+_U32_BE = struct.Struct('>I')
+_WT_HEADER = struct.Struct('<II')
+_WAV_FMT = struct.Struct('<HHI')
+
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class WavetableData:
     """Parsed wavetable data."""
     id: str
@@ -44,10 +72,11 @@ class WavetableData:
     is_third_party: bool = False
     contributor: Optional[str] = None
     data_b64: Optional[str] = None
+    sample_scale: Optional[float] = None
     sha256: Optional[str] = None
     file_size: int = 0
     
-@dataclass
+@dataclass(slots=True)
 class OscillatorData:
     """Oscillator settings from a preset."""
     index: int
@@ -68,7 +97,7 @@ class OscillatorData:
     fm_depth: float = 0.0
     extra_params: str = "{}"
 
-@dataclass
+@dataclass(slots=True)
 class FilterData:
     """Filter settings from a preset."""
     index: int
@@ -82,7 +111,7 @@ class FilterData:
     env_depth: float = 0.0
     extra_params: str = "{}"
 
-@dataclass
+@dataclass(slots=True)
 class EnvelopeData:
     """Envelope settings."""
     name: str
@@ -94,7 +123,7 @@ class EnvelopeData:
     decay_curve: float = 0.0
     release_curve: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class LFOData:
     """LFO settings."""
     index: int
@@ -108,7 +137,7 @@ class LFOData:
     delay: float = 0.0
     fade_in: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class ModulationData:
     """Modulation routing."""
     source: str
@@ -116,7 +145,7 @@ class ModulationData:
     amount: float
     bipolar: bool = True
 
-@dataclass 
+@dataclass(slots=True)
 class EffectData:
     """Effect settings."""
     effect_type: str
@@ -124,7 +153,7 @@ class EffectData:
     mix: float = 1.0
     params: str = "{}"
 
-@dataclass
+@dataclass(slots=True)
 class PresetData:
     """Complete preset data."""
     id: str
@@ -149,29 +178,74 @@ class PresetData:
     sha256: Optional[str] = None
     file_size: int = 0
 
+@lru_cache(maxsize=None)
+def _record_fields(cls) -> Tuple[Tuple[str, ...], attrgetter]:
+    names = tuple(f.name for f in fields(cls))
+    return names, attrgetter(*names)
+
+def record_to_dict(record) -> Dict[str, Any]:
+    """Shallow dict of a slotted dataclass, in field order.
+    
+    Replaces dataclasses.asdict, which re-inspects the fields and deep-copies
+    every value on each call.
+    """
+    names, getter = _record_fields(type(record))
+    return dict(zip(names, getter(record)))
+
 # ============================================================================
 # SURGE WAVETABLE PARSING
 # ============================================================================
 
+def path_id(path: str) -> str:
+    """16 hex character id for an asset path.
+    
+    This is the primary key of existing databases, and it matches
+    synth-asset-downloader.py, so it has to stay the SHA-256 prefix.
+    """
+    return hashlib.sha256(path.encode()).hexdigest()[:16]
+
+def classify_wavetable_path(path: str) -> Tuple[bool, Optional[str], str]:
+    """Return (is_third_party, contributor, category) for a wavetable path."""
+    if 'wavetables_3rdparty' in path:
+        folder, sep, _ = path.rpartition('wavetables_3rdparty/')[2].rpartition('/')
+        if sep:
+            return True, folder.partition('/')[0], folder
+        return True, None, 'Uncategorized'
+    
+    folder, sep, _ = path.rpartition('wavetables/')[2].rpartition('/')
+    return False, None, folder if sep else 'root'
+
+# 16-bit sources are stored as their raw int16 samples; consumers multiply by
+# sample_scale to get floats. Everything else is stored as float32 with a
+# NULL sample_scale.
+INT16_SAMPLE_SCALE = 1.0 / 32768.0
+
+def encode_samples_b64(samples: np.ndarray) -> str:
+    """Base64 encode samples straight from the array buffer."""
+    return base64.b64encode(np.ascontiguousarray(samples)).decode('ascii')
+
 def parse_surge_wt(file_path: Path) -> Optional[WavetableData]:
     """Parse a Surge .wt wavetable file."""
     try:
-        data = file_path.read_bytes()
-        if len(data) < 12:
-            return None
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < 12:
+                return None
+            # Map the file rather than reading it; the header check, sample
+            # view and hash all work on the mapping without copying
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        mv = memoryview(data)
         
         # Surge WT magic: 'vaws' (0x77617673) in little-endian
-        magic = struct.unpack('<I', data[0:4])[0]
+        magic = _U32_LE.unpack_from(mv, 0)[0]
         if magic != 0x77617673:
             return None
         
-        frame_size = struct.unpack('<I', data[4:8])[0]
-        frame_count = struct.unpack('<I', data[8:12])[0]
+        frame_size, frame_count = _WT_HEADER.unpack_from(mv, 4)
         
         flags = 0
         header_size = 12
         if len(data) >= 16:
-            flags = struct.unpack('<I', data[12:16])[0]
+            flags = _U32_LE.unpack_from(mv, 12)[0]
             header_size = 16
         
         is_float = (flags & 0x04) != 0
@@ -181,37 +255,26 @@ def parse_surge_wt(file_path: Path) -> Optional[WavetableData]:
             expected_size = header_size + samples_per_table * 4
             if len(data) < expected_size:
                 return None
-            samples = struct.unpack(f'<{samples_per_table}f', 
-                                   data[header_size:header_size + samples_per_table * 4])
+            samples = np.frombuffer(mv, dtype='<f4', count=samples_per_table,
+                                    offset=header_size)
+            sample_scale = None
         else:
             expected_size = header_size + samples_per_table * 2
             if len(data) < expected_size:
                 return None
-            int_samples = struct.unpack(f'<{samples_per_table}h', 
-                                       data[header_size:header_size + samples_per_table * 2])
-            samples = [s / 32768.0 for s in int_samples]
-        
-        # Convert to float32 and base64 encode
-        float_array = array.array('f', samples)
-        data_b64 = base64.b64encode(float_array.tobytes()).decode('ascii')
-        
-        # Determine category from path
-        rel_path = str(file_path)
-        is_third_party = 'wavetables_3rdparty' in rel_path
-        
-        if is_third_party:
-            parts = rel_path.split('wavetables_3rdparty/')[-1].split('/')
-            contributor = parts[0] if len(parts) > 1 else None
-            category = '/'.join(parts[:-1]) if len(parts) > 1 else 'Uncategorized'
-        else:
-            parts = rel_path.split('wavetables/')[-1].split('/')
-            contributor = None
-            category = '/'.join(parts[:-1]) if len(parts) > 1 else 'root'
+            # Keep the int16 samples as-is; half the size of float32, lossless
+            samples = np.frombuffer(mv, dtype='<i2', count=samples_per_table,
+                                    offset=header_size)
+            sample_scale = INT16_SAMPLE_SCALE
+        
+        data_b64 = encode_samples_b64(samples)
+        
+        is_third_party, contributor, category = classify_wavetable_path(str(file_path))
         
         name = file_path.stem
         
         return WavetableData(
-            id=hashlib.sha256(str(file_path).encode()).hexdigest()[:16],
+            id=path_id(str(file_path)),
             name=name,
             source='surge',
             category=category,
@@ -222,7 +285,8 @@ def parse_surge_wt(file_path: Path) -> Optional[WavetableData]:
             is_third_party=is_third_party,
             contributor=contributor,
             data_b64=data_b64,
-            sha256=hashlib.sha256(data).hexdigest(),
+            sample_scale=sample_scale,
+            sha256=hashlib.sha256(mv).hexdigest(),
             file_size=len(data)
         )
         
@@ -230,6 +294,32 @@ def parse_surge_wt(file_path: Path) -> Optional[WavetableData]:
         print(f"  Error parsing {file_path}: {e}")
         return None
 
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _decode_pcm24_kernel(buf, stride, out):
+        for i in range(out.shape[0]):
+            j = i * stride
+            v = np.int32(buf[j]) | (np.int32(buf[j + 1]) << 8) | (np.int32(buf[j + 2]) << 16)
+            # Sign-extend from bit 23
+            v = (v ^ 0x800000) - 0x800000
+            out[i] = v * np.float32(1.0 / 8388608.0)
+
+def decode_pcm24(buf: np.ndarray, stride: int) -> np.ndarray:
+    """Decode the first 24-bit little-endian sample of each frame to float32."""
+    total_samples = len(buf) // stride
+    if njit is not None:
+        samples = np.empty(total_samples, dtype=np.float32)
+        _decode_pcm24_kernel(buf, stride, samples)
+        return samples
+    
+    # Left-pad each 3-byte sample to 4 bytes; the arithmetic shift back
+    # down sign-extends it
+    padded = np.zeros((total_samples, 4), dtype=np.uint8)
+    padded[:, 1:] = buf.reshape(-1, stride)[:, :3]
+    samples = (padded.view('<i4')[:, 0] >> 8).astype(np.float32)
+    samples *= np.float32(1.0 / 8388608.0)
+    return samples
+
 def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
     """Parse a WAV file as wavetable."""
     try:
@@ -241,19 +331,20 @@ def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
         if data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
             return None
         
-        # Parse WAV chunks
+        # Parse WAV chunks; slices of the memoryview are zero-copy
+        mv = memoryview(data)
         pos = 12
         fmt_data = None
         audio_data = None
         
         while pos < len(data) - 8:
-            chunk_id = data[pos:pos+4]
-            chunk_size = struct.unpack('<I', data[pos+4:pos+8])[0]
+            chunk_id = bytes(mv[pos:pos+4])
+            chunk_size = _U32_LE.unpack_from(mv, pos+4)[0]
             
             if chunk_id == b'fmt ':
-                fmt_data = data[pos+8:pos+8+chunk_size]
+                fmt_data = mv[pos+8:pos+8+chunk_size]
             elif chunk_id == b'data':
-                audio_data = data[pos+8:pos+8+chunk_size]
+                audio_data = mv[pos+8:pos+8+chunk_size]
                 break
                 
             pos += 8 + chunk_size
@@ -263,10 +354,8 @@ def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
         if not fmt_data or not audio_data:
             return None
         
-        audio_format = struct.unpack('<H', fmt_data[0:2])[0]
-        num_channels = struct.unpack('<H', fmt_data[2:4])[0]
-        sample_rate = struct.unpack('<I', fmt_data[4:8])[0]
-        bits_per_sample = struct.unpack('<H', fmt_data[14:16])[0]
+        audio_format, num_channels, sample_rate = _WAV_FMT.unpack_from(fmt_data, 0)
+        bits_per_sample = _U16_LE.unpack_from(fmt_data, 14)[0]
         
         if audio_format not in [1, 3]:  # PCM or IEEE float
             return None
@@ -274,23 +363,6 @@ def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
         bytes_per_sample = bits_per_sample // 8
         total_samples = len(audio_data) // (bytes_per_sample * num_channels)
         
-        samples = []
-        for i in range(total_samples):
-            offset = i * bytes_per_sample * num_channels
-            if bits_per_sample == 16:
-                val = struct.unpack('<h', audio_data[offset:offset+2])[0]
-                samples.append(val / 32768.0)
-            elif bits_per_sample == 24:
-                b = audio_data[offset:offset+3]
-                val = struct.unpack('<i', b + (b'\x00' if b[2] < 128 else b'\xff'))[0]
-                samples.append(val / 8388608.0)
-            elif bits_per_sample == 32:
-                if audio_format == 3:
-                    val = struct.unpack('<f', audio_data[offset:offset+4])[0]
-                else:
-                    val = struct.unpack('<i', audio_data[offset:offset+4])[0] / 2147483648.0
-                samples.append(val)
-        
         # Detect frame size
         frame_size = 2048  # Default Serum-style
         common_sizes = [256, 512, 1024, 2048, 4096]
@@ -300,28 +372,34 @@ def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
                 break
         
         frame_count = max(1, total_samples // frame_size)
-        samples = samples[:frame_count * frame_size]
         
-        float_array = array.array('f', samples)
-        data_b64 = base64.b64encode(float_array.tobytes()).decode('ascii')
+        # Frames are interleaved; view channel 0 of just the frames that are
+        # kept, so nothing past the last whole wavetable frame is converted
+        frame_bytes = bytes_per_sample * num_channels
+        kept_samples = min(total_samples, frame_count * frame_size)
+        pcm = audio_data[:kept_samples * frame_bytes]
+        sample_scale = None
+        if bits_per_sample == 16:
+            samples = np.frombuffer(pcm, dtype='<i2').reshape(-1, num_channels)[:, 0]
+            sample_scale = INT16_SAMPLE_SCALE
+        elif bits_per_sample == 24:
+            samples = decode_pcm24(np.frombuffer(pcm, dtype=np.uint8), frame_bytes)
+        elif bits_per_sample == 32 and audio_format == 3:
+            samples = np.frombuffer(pcm, dtype='<f4').reshape(-1, num_channels)[:, 0]
+        elif bits_per_sample == 32:
+            samples = np.frombuffer(pcm, dtype='<i4').reshape(-1, num_channels)[:, 0].astype(np.float32)
+            samples *= np.float32(1.0 / 2147483648.0)
+        else:
+            samples = np.empty(0, dtype=np.float32)
         
-        # Determine category from path
-        rel_path = str(file_path)
-        is_third_party = 'wavetables_3rdparty' in rel_path
+        data_b64 = encode_samples_b64(samples)
         
-        if is_third_party:
-            parts = rel_path.split('wavetables_3rdparty/')[-1].split('/')
-            contributor = parts[0] if len(parts) > 1 else None
-            category = '/'.join(parts[:-1]) if len(parts) > 1 else 'Uncategorized'
-        else:
-            parts = rel_path.split('wavetables/')[-1].split('/')
-            contributor = None
-            category = '/'.join(parts[:-1]) if len(parts) > 1 else 'root'
+        is_third_party, contributor, category = classify_wavetable_path(str(file_path))
         
         name = file_path.stem
         
         return WavetableData(
-            id=hashlib.sha256(str(file_path).encode()).hexdigest()[:16],
+            id=path_id(str(file_path)),
             name=name,
             source='surge',
             category=category,
@@ -333,7 +411,8 @@ def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
             is_third_party=is_third_party,
             contributor=contributor,
             data_b64=data_b64,
-            sha256=hashlib.sha256(data).hexdigest(),
+            sample_scale=sample_scale,
+            sha256=hashlib.sha256(mv).hexdigest(),
             file_size=len(data)
         )
         
@@ -341,6 +420,34 @@ def parse_surge_wav(file_path: Path) -> Optional[WavetableData]:
         print(f"  Error parsing WAV {file_path}: {e}")
         return None
 
+WAVETABLE_EXTENSIONS = ('.wt', '.wav')
+PRESET_EXTENSIONS = ('.fxp',)
+
+# Files handed to each worker process at a time
+PARSE_CHUNKSIZE = 32
+
+def walk_files(root: Path, extensions: Tuple[str, ...]):
+    """Yield files under root whose name ends with one of extensions.
+    
+    Filters on the directory entry name before building a Path, so the
+    many unrelated files in the Surge tree cost no extra stat or object.
+    """
+    subdirs = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.lower().endswith(extensions):
+                yield Path(entry.path)
+    for subdir in subdirs:
+        yield from walk_files(subdir, extensions)
+
+def parse_wavetable_file(file_path: Path) -> Optional[WavetableData]:
+    """Parse a .wt or .wav wavetable, dispatching on the file extension."""
+    if file_path.suffix.lower() == '.wt':
+        return parse_surge_wt(file_path)
+    return parse_surge_wav(file_path)
+
 # ============================================================================
 # SURGE PRESET PARSING
 # ============================================================================
@@ -364,24 +471,28 @@ def parse_surge_fxp(file_path: Path) -> Optional[PresetData]:
         preset_name = preset_name_bytes.split(b'\x00')[0].decode('utf-8', errors='replace')
         
         if fx_magic == b'FPCh':
-            chunk_size = struct.unpack('>I', data[56:60])[0]
-            chunk_data = data[60:60+chunk_size]
+            chunk_size = _U32_BE.unpack_from(data, 56)[0]
+            chunk_start = 60
+            chunk_end = min(len(data), chunk_start + chunk_size)
             
-            # Find XML in chunk
-            xml_start = -1
-            for i in range(min(len(chunk_data), 1000)):
-                if chunk_data[i:i+5] == b'<?xml' or chunk_data[i:i+6] == b'<patch':
-                    xml_start = i
-                    break
+            # Find XML starting within the first 1000 bytes of the chunk
+            search_end = min(chunk_start + 1000, chunk_end)
+            starts = [pos for pos in (
+                data.find(b'<?xml', chunk_start, min(search_end + 4, chunk_end)),
+                data.find(b'<patch', chunk_start, min(search_end + 5, chunk_end)),
+            ) if pos >= 0]
             
-            if xml_start >= 0:
-                xml_end = len(chunk_data)
-                for i in range(len(chunk_data) - 1, xml_start, -1):
-                    if chunk_data[i] == ord('>'):
-                        xml_end = i + 1
-                        break
+            if starts:
+                xml_start = min(starts)
+                # End after the closing </patch> tag, so trailing chunk bytes
+                # never leak into the XML; fall back to the last '>'
+                patch_close = data.rfind(b'</patch>', xml_start, chunk_end)
+                if patch_close >= 0:
+                    xml_end = patch_close + len(b'</patch>')
+                else:
+                    xml_end = data.rfind(b'>', xml_start + 1, chunk_end) + 1 or chunk_end
                 
-                xml_str = chunk_data[xml_start:xml_end].decode('utf-8', errors='replace')
+                xml_str = str(memoryview(data)[xml_start:xml_end], 'utf-8', errors='replace')
                 return parse_surge_preset_xml(xml_str, str(file_path), preset_name)
         
         return None
@@ -411,111 +522,102 @@ def parse_surge_preset_xml(xml_str: str, path: str, preset_name: str) -> Optiona
         modulations = []
         effects = []
         
-        # Parse scenes
-        for scene in root.findall('.//scene'):
-            # Parse oscillators
-            for i, osc in enumerate(scene.findall('.//osc')):
-                osc_type = int(osc.get('type', 0))
-                osc_data = OscillatorData(
-                    index=i,
-                    osc_type=osc_type,
-                    osc_type_name=get_surge_osc_type_name(osc_type),
-                    wavetable_name=osc.get('wavetable'),
-                    wavetable_position=float(osc.get('morph', 0)),
-                    level=float(osc.get('level', 1)),
-                    pan=float(osc.get('pan', 0)),
-                    tune_semitones=float(osc.get('pitch', 0)),
-                    tune_cents=float(osc.get('detune', 0)),
-                    unison_voices=int(osc.get('unison_voices', 1)),
-                    unison_detune=float(osc.get('unison_detune', 0)),
-                )
-                oscillators.append(asdict(osc_data))
-            
-            # Parse filters
-            for i, filt in enumerate(scene.findall('.//filter')):
-                filt_type = int(filt.get('type', 0))
-                filt_data = FilterData(
-                    index=i,
-                    filter_type=filt_type,
-                    filter_type_name=get_surge_filter_type_name(filt_type),
-                    cutoff=float(filt.get('cutoff', 1000)),
-                    resonance=float(filt.get('resonance', 0)),
-                    drive=float(filt.get('drive', 0)),
-                    keytrack=float(filt.get('keytrack', 0)),
-                )
-                filters.append(asdict(filt_data))
-            
-            # Parse envelopes
-            for env in scene.findall('.//envelope'):
-                env_name = env.get('id', 'amp')
-                env_data = EnvelopeData(
-                    name=env_name,
-                    attack=float(env.get('attack', 0.01)),
-                    decay=float(env.get('decay', 0.1)),
-                    sustain=float(env.get('sustain', 0.7)),
-                    release=float(env.get('release', 0.3)),
+        # One pass over the tree collects scenes, modulation routings and effects
+        scenes = []
+        for elem in root.iter():
+            tag = elem.tag
+            if tag == 'scene' and elem is not root:
+                scenes.append(elem)
+            elif tag == 'modrouting':
+                mod_data = ModulationData(
+                    source=elem.get('source', ''),
+                    destination=elem.get('destination', ''),
+                    amount=float(elem.get('depth', 0)),
                 )
-                envelopes.append(asdict(env_data))
-            
-            # Parse LFOs
-            for i, lfo in enumerate(scene.findall('.//lfo')):
-                shape = int(lfo.get('shape', 0))
-                lfo_data = LFOData(
-                    index=i,
-                    waveform=shape,
-                    waveform_name=get_surge_lfo_shape_name(shape),
-                    rate=float(lfo.get('rate', 1)),
-                    sync=lfo.get('temposync', '0') == '1',
-                    depth=float(lfo.get('magnitude', 1)),
+                modulations.append(record_to_dict(mod_data))
+            elif tag == 'fx':
+                fx_data = EffectData(
+                    effect_type=elem.get('type', 'off'),
+                    enabled=elem.get('enabled', '1') == '1',
+                    mix=float(elem.get('mix', 1)),
                 )
-                lfos.append(asdict(lfo_data))
-        
-        # Parse modulation matrix
-        for mod in root.findall('.//modrouting'):
-            mod_data = ModulationData(
-                source=mod.get('source', ''),
-                destination=mod.get('destination', ''),
-                amount=float(mod.get('depth', 0)),
-            )
-            modulations.append(asdict(mod_data))
-        
-        # Parse effects
-        for fx in root.findall('.//fx'):
-            fx_type = fx.get('type', 'off')
-            fx_data = EffectData(
-                effect_type=fx_type,
-                enabled=fx.get('enabled', '1') == '1',
-                mix=float(fx.get('mix', 1)),
-            )
-            effects.append(asdict(fx_data))
-        
-        # Determine category from path
-        rel_path = path
-        is_third_party = 'patches_3rdparty' in rel_path
-        
-        if is_third_party:
-            parts = rel_path.split('patches_3rdparty/')[-1].split('/')
-            if len(parts) > 1:
-                category = parts[0]  # First part after patches_3rdparty
-        else:
-            parts = rel_path.split('patches_factory/')[-1].split('/')
-            if len(parts) > 1:
-                category = parts[0]  # First part after patches_factory
+                effects.append(record_to_dict(fx_data))
+        
+        # Parse scenes, dispatching on tag in a single walk of each scene;
+        # oscillator, filter and LFO indices restart in every scene
+        for scene in scenes:
+            osc_index = filt_index = lfo_index = 0
+            for elem in scene.iter():
+                tag = elem.tag
+                if tag == 'osc':
+                    osc_type = int(elem.get('type', 0))
+                    osc_data = OscillatorData(
+                        index=osc_index,
+                        osc_type=osc_type,
+                        osc_type_name=get_surge_osc_type_name(osc_type),
+                        wavetable_name=elem.get('wavetable'),
+                        wavetable_position=float(elem.get('morph', 0)),
+                        level=float(elem.get('level', 1)),
+                        pan=float(elem.get('pan', 0)),
+                        tune_semitones=float(elem.get('pitch', 0)),
+                        tune_cents=float(elem.get('detune', 0)),
+                        unison_voices=int(elem.get('unison_voices', 1)),
+                        unison_detune=float(elem.get('unison_detune', 0)),
+                    )
+                    oscillators.append(record_to_dict(osc_data))
+                    osc_index += 1
+                elif tag == 'filter':
+                    filt_type = int(elem.get('type', 0))
+                    filt_data = FilterData(
+                        index=filt_index,
+                        filter_type=filt_type,
+                        filter_type_name=get_surge_filter_type_name(filt_type),
+                        cutoff=float(elem.get('cutoff', 1000)),
+                        resonance=float(elem.get('resonance', 0)),
+                        drive=float(elem.get('drive', 0)),
+                        keytrack=float(elem.get('keytrack', 0)),
+                    )
+                    filters.append(record_to_dict(filt_data))
+                    filt_index += 1
+                elif tag == 'envelope':
+                    env_data = EnvelopeData(
+                        name=elem.get('id', 'amp'),
+                        attack=float(elem.get('attack', 0.01)),
+                        decay=float(elem.get('decay', 0.1)),
+                        sustain=float(elem.get('sustain', 0.7)),
+                        release=float(elem.get('release', 0.3)),
+                    )
+                    envelopes.append(record_to_dict(env_data))
+                elif tag == 'lfo':
+                    shape = int(elem.get('shape', 0))
+                    lfo_data = LFOData(
+                        index=lfo_index,
+                        waveform=shape,
+                        waveform_name=get_surge_lfo_shape_name(shape),
+                        rate=float(elem.get('rate', 1)),
+                        sync=elem.get('temposync', '0') == '1',
+                        depth=float(elem.get('magnitude', 1)),
+                    )
+                    lfos.append(record_to_dict(lfo_data))
+                    lfo_index += 1
+        
+        # Determine category from the first directory under the patch root
+        category = classify_preset_path(path, category)
         
         return PresetData(
-            id=hashlib.sha256(path.encode()).hexdigest()[:16],
+            id=path_id(path),
             name=name,
             source='surge',
             category=category,
             path=path,
             author=author,
             description=comment,
-            oscillators=json.dumps(oscillators),
-            filters=json.dumps(filters),
-            envelopes=json.dumps(envelopes),
-            lfos=json.dumps(lfos),
-            modulations=json.dumps(modulations),
-            effects=json.dumps(effects),
+            oscillators=dumps_json(oscillators),
+            filters=dumps_json(filters),
+            envelopes=dumps_json(envelopes),
+            lfos=dumps_json(lfos),
+            modulations=dumps_json(modulations),
+            effects=dumps_json(effects),
             raw_data=xml_str[:10000],
             sha256=hashlib.sha256(xml_str.encode()).hexdigest(),
             file_size=len(xml_str)
@@ -524,35 +626,49 @@ def parse_surge_preset_xml(xml_str: str, path: str, preset_name: str) -> Optiona
     except ET.ParseError as e:
         return None
 
+def classify_preset_path(path: str, default: str) -> str:
+    """Return the folder directly under the patch root, or default."""
+    root = 'patches_3rdparty/' if 'patches_3rdparty' in path else 'patches_factory/'
+    folder, sep, _ = path.rpartition(root)[2].partition('/')
+    return folder if sep else default
+
+SURGE_OSC_TYPE_NAMES = (
+    'Classic', 'Sine', 'Wavetable', 'SH Noise',
+    'Audio Input', 'FM3', 'FM2', 'Window',
+    'Modern', 'String', 'Twist', 'Alias',
+    'Phase Mod',
+)
+
+SURGE_FILTER_TYPE_NAMES = (
+    'Off', 'LP 12dB', 'LP 24dB', 'LP Legacy',
+    'HP 12dB', 'HP 24dB', 'BP 12dB', 'BP 24dB',
+    'Notch 12dB', 'Notch 24dB', 'Comb+', 'Comb-',
+    'Sample&Hold', 'Vintage Ladder', 'OB-Xd 12dB', 'OB-Xd 24dB',
+    'K35 LP', 'K35 HP', 'Diode Ladder', 'Cutoff Warp LP',
+    'Cutoff Warp HP', 'Cutoff Warp BP', 'Cutoff Warp N', 'Resonance Warp LP',
+    'Resonance Warp HP', 'Resonance Warp BP', 'Resonance Warp N', 'Tri-Pole',
+)
+
+SURGE_LFO_SHAPE_NAMES = (
+    'Sine', 'Triangle', 'Square', 'Ramp',
+    'Noise', 'S&H', 'Envelope', 'Stepseq',
+    'MSEG', 'Function',
+)
+
 def get_surge_osc_type_name(osc_type: int) -> str:
-    names = {
-        0: 'Classic', 1: 'Sine', 2: 'Wavetable', 3: 'SH Noise',
-        4: 'Audio Input', 5: 'FM3', 6: 'FM2', 7: 'Window',
-        8: 'Modern', 9: 'String', 10: 'Twist', 11: 'Alias',
-        12: 'Phase Mod'
-    }
-    return names.get(osc_type, f'Unknown ({osc_type})')
+    if 0 <= osc_type < len(SURGE_OSC_TYPE_NAMES):
+        return SURGE_OSC_TYPE_NAMES[osc_type]
+    return f'Unknown ({osc_type})'
 
 def get_surge_filter_type_name(filt_type: int) -> str:
-    names = {
-        0: 'Off', 1: 'LP 12dB', 2: 'LP 24dB', 3: 'LP Legacy',
-        4: 'HP 12dB', 5: 'HP 24dB', 6: 'BP 12dB', 7: 'BP 24dB',
-        8: 'Notch 12dB', 9: 'Notch 24dB', 10: 'Comb+', 11: 'Comb-',
-        12: 'Sample&Hold', 13: 'Vintage Ladder', 14: 'OB-Xd 12dB',
-        15: 'OB-Xd 24dB', 16: 'K35 LP', 17: 'K35 HP', 18: 'Diode Ladder',
-        19: 'Cutoff Warp LP', 20: 'Cutoff Warp HP', 21: 'Cutoff Warp BP',
-        22: 'Cutoff Warp N', 23: 'Resonance Warp LP', 24: 'Resonance Warp HP',
-        25: 'Resonance Warp BP', 26: 'Resonance Warp N', 27: 'Tri-Pole'
-    }
-    return names.get(filt_type, f'Unknown ({filt_type})')
+    if 0 <= filt_type < len(SURGE_FILTER_TYPE_NAMES):
+        return SURGE_FILTER_TYPE_NAMES[filt_type]
+    return f'Unknown ({filt_type})'
 
 def get_surge_lfo_shape_name(shape: int) -> str:
-    names = {
-        0: 'Sine', 1: 'Triangle', 2: 'Square', 3: 'Ramp',
-        4: 'Noise', 5: 'S&H', 6: 'Envelope', 7: 'Stepseq',
-        8: 'MSEG', 9: 'Function'
-    }
-    return names.get(shape, f'Unknown ({shape})')
+    if 0 <= shape < len(SURGE_LFO_SHAPE_NAMES):
+        return SURGE_LFO_SHAPE_NAMES[shape]
+    return f'Unknown ({shape})'
 
 # ============================================================================
 # DATABASE
@@ -560,10 +676,13 @@ def get_surge_lfo_shape_name(shape: int) -> str:
 
 def create_database(db_path: str) -> sqlite3.Connection:
     """Create SQLite database with schema."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
+    # Rows are written from a background thread, see write_rows
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')
+    conn.execute('''
         CREATE TABLE IF NOT EXISTS wavetables (
             id TEXT PRIMARY KEY,
             name TEXT NOT NULL,
@@ -577,13 +696,19 @@ def create_database(db_path: str) -> sqlite3.Connection:
             is_third_party INTEGER DEFAULT 0,
             contributor TEXT,
             data_b64 TEXT,
+            sample_scale REAL,
             sha256 TEXT,
             file_size INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
     
-    cursor.execute('''
+    # Databases built before sample_scale existed need the column added
+    wt_columns = {row[1] for row in conn.execute('PRAGMA table_info(wavetables)')}
+    if 'sample_scale' not in wt_columns:
+        conn.execute('ALTER TABLE wavetables ADD COLUMN sample_scale REAL')
+    
+    conn.execute('''
         CREATE TABLE IF NOT EXISTS presets (
             id TEXT PRIMARY KEY,
             name TEXT NOT NULL,
@@ -610,16 +735,16 @@ def create_database(db_path: str) -> sqlite3.Connection:
         )
     ''')
     
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_source ON wavetables(source)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_category ON wavetables(category)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_name ON wavetables(name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_source ON wavetables(source)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_category ON wavetables(category)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_name ON wavetables(name)')
     
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_source ON presets(source)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_category ON presets(category)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_author ON presets(author)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_name ON presets(name)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_presets_source ON presets(source)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_presets_category ON presets(category)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_presets_author ON presets(author)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_presets_name ON presets(name)')
     
-    cursor.execute('''
+    conn.execute('''
         CREATE TABLE IF NOT EXISTS metadata (
             key TEXT PRIMARY KEY,
             value TEXT
@@ -629,34 +754,82 @@ def create_database(db_path: str) -> sqlite3.Connection:
     conn.commit()
     return conn
 
-def insert_wavetable(conn: sqlite3.Connection, wt: WavetableData):
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT OR REPLACE INTO wavetables 
-        (id, name, source, category, path, frame_count, frame_size, sample_rate, 
-         bit_depth, is_third_party, contributor, data_b64, sha256, file_size)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+INSERT_WAVETABLE_SQL = '''
+    INSERT OR REPLACE INTO wavetables 
+    (id, name, source, category, path, frame_count, frame_size, sample_rate, 
+     bit_depth, is_third_party, contributor, data_b64, sample_scale, sha256, file_size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_PRESET_SQL = '''
+    INSERT OR REPLACE INTO presets
+    (id, name, source, category, path, author, description, tags, oscillators,
+     filters, envelopes, lfos, modulations, effects, master_volume, master_tune,
+     polyphony, portamento, raw_data, sha256, file_size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+def wavetable_row(wt: WavetableData) -> Tuple:
+    return (
         wt.id, wt.name, wt.source, wt.category, wt.path, wt.frame_count,
         wt.frame_size, wt.sample_rate, wt.bit_depth, 1 if wt.is_third_party else 0,
-        wt.contributor, wt.data_b64, wt.sha256, wt.file_size
-    ))
-
-def insert_preset(conn: sqlite3.Connection, preset: PresetData):
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT OR REPLACE INTO presets
-        (id, name, source, category, path, author, description, tags, oscillators,
-         filters, envelopes, lfos, modulations, effects, master_volume, master_tune,
-         polyphony, portamento, raw_data, sha256, file_size)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+        wt.contributor, wt.data_b64, wt.sample_scale, wt.sha256, wt.file_size
+    )
+
+def preset_row(preset: PresetData) -> Tuple:
+    return (
         preset.id, preset.name, preset.source, preset.category, preset.path,
         preset.author, preset.description, preset.tags, preset.oscillators,
         preset.filters, preset.envelopes, preset.lfos, preset.modulations,
         preset.effects, preset.master_volume, preset.master_tune, preset.polyphony,
         preset.portamento, preset.raw_data, preset.sha256, preset.file_size
-    ))
+    )
+
+def iter_rows(results, to_row, label: str, progress_every: int):
+    """Yield insert rows for the successfully parsed results, with progress."""
+    count = 0
+    for result in results:
+        if result:
+            count += 1
+            if count % progress_every == 0:
+                print(f"  Parsed {count} {label}...")
+            yield to_row(result)
+
+# Rows per background write; each batch is committed as it lands
+WRITE_BATCH_SIZE = 500
+
+# Batches allowed to queue up behind the writer before parsing waits
+MAX_PENDING_WRITES = 4
+
+def write_batch(conn: sqlite3.Connection, sql: str, batch: List[Tuple]):
+    conn.executemany(sql, batch)
+    conn.commit()
+
+def write_rows(conn: sqlite3.Connection, sql: str, rows) -> int:
+    """Insert rows on a writer thread, committing one batch at a time.
+    
+    The commit of each batch overlaps with collecting the next one from the
+    parser pool. Returns the number of rows written.
+    """
+    count = 0
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) < WRITE_BATCH_SIZE:
+                continue
+            pending.append(writer.submit(write_batch, conn, sql, batch))
+            count += len(batch)
+            batch = []
+            if len(pending) > MAX_PENDING_WRITES:
+                pending.popleft().result()
+        if batch:
+            pending.append(writer.submit(write_batch, conn, sql, batch))
+            count += len(batch)
+        for future in pending:
+            future.result()
+    return count
 
 # ============================================================================
 # MAIN
@@ -696,7 +869,7 @@ def main():
         surge_path / 'resources' / 'data' / 'wavetables_3rdparty',
     ]
     
-    wavetable_count = 0
+    wt_files = []
     
     for wt_dir in wt_dirs:
         if not wt_dir.exists():
@@ -704,26 +877,17 @@ def main():
             continue
         
         print(f"\nScanning: {wt_dir}")
-        
-        for file_path in wt_dir.rglob('*'):
-            if file_path.suffix.lower() == '.wt':
-                wt = parse_surge_wt(file_path)
-                if wt:
-                    insert_wavetable(conn, wt)
-                    wavetable_count += 1
-                    if wavetable_count % 50 == 0:
-                        print(f"  Parsed {wavetable_count} wavetables...")
-                        conn.commit()
-            elif file_path.suffix.lower() == '.wav':
-                wt = parse_surge_wav(file_path)
-                if wt:
-                    insert_wavetable(conn, wt)
-                    wavetable_count += 1
-                    if wavetable_count % 50 == 0:
-                        print(f"  Parsed {wavetable_count} wavetables...")
-                        conn.commit()
+        wt_files.extend(walk_files(wt_dir, WAVETABLE_EXTENSIONS))
     
-    conn.commit()
+    # Files are independent, so parse them across processes and let the
+    # main process be the single SQLite writer
+    executor = ProcessPoolExecutor()
+    
+    # Rows stream from the worker results to a background SQLite writer
+    wt_rows = iter_rows(
+        executor.map(parse_wavetable_file, wt_files, chunksize=PARSE_CHUNKSIZE),
+        wavetable_row, 'wavetables', 50)
+    wavetable_count = write_rows(conn, INSERT_WAVETABLE_SQL, wt_rows)
     print(f"\nTotal wavetables: {wavetable_count}")
     
     # Parse presets
@@ -734,7 +898,7 @@ def main():
         surge_path / 'resources' / 'data' / 'patches_3rdparty',
     ]
     
-    preset_count = 0
+    preset_files = []
     
     for preset_dir in preset_dirs:
         if not preset_dir.exists():
@@ -742,30 +906,26 @@ def main():
             continue
         
         print(f"\nScanning: {preset_dir}")
-        
-        for file_path in preset_dir.rglob('*.fxp'):
-            preset = parse_surge_fxp(file_path)
-            if preset:
-                insert_preset(conn, preset)
-                preset_count += 1
-                if preset_count % 100 == 0:
-                    print(f"  Parsed {preset_count} presets...")
-                    conn.commit()
+        preset_files.extend(walk_files(preset_dir, PRESET_EXTENSIONS))
     
-    conn.commit()
+    preset_rows = iter_rows(
+        executor.map(parse_surge_fxp, preset_files, chunksize=PARSE_CHUNKSIZE),
+        preset_row, 'presets', 100)
+    preset_count = write_rows(conn, INSERT_PRESET_SQL, preset_rows)
+    executor.shutdown()
     print(f"\nTotal presets: {preset_count}")
     
     # Store metadata
-    cursor = conn.cursor()
-    cursor.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)', 
-                  ('last_updated', datetime.datetime.now().isoformat()))
-    cursor.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
-                  ('version', '1.0.0'))
-    cursor.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
-                  ('total_wavetables', str(wavetable_count)))
-    cursor.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
-                  ('total_presets', str(preset_count)))
+    conn.executemany('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)', [
+        ('last_updated', datetime.datetime.now().isoformat()),
+        ('version', '1.0.0'),
+        ('total_wavetables', str(wavetable_count)),
+        ('total_presets', str(preset_count)),
+    ])
     conn.commit()
+    # Leave the shipped file in rollback-journal mode so read-only
+    # consumers don't need to create -wal/-shm files next to it
+    conn.execute('PRAGMA journal_mode=DELETE')
     conn.close()
     
     print("\n" + "=" * 60)
@@ -6,13 +6,39 @@ This script reads the existing synth-assets.db and creates a new database
 organized by instrument category rather than by source/author.
 """
 
+import os
 import sqlite3
 import json
 import re
 import hashlib
+from sys import intern
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+# numba is optional; it JIT-compiles the envelope/oscillator hint kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# orjson is optional; it parses the preset JSON columns several times faster
+try:
+    import orjson
+    
+    def loads_json(text: str):
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # json.dumps-written sources may hold NaN/Infinity, which orjson rejects
+            return json.loads(text)
+except ImportError:
+    loads_json = json.loads
 
 # ============================================================================
 # CATEGORY DEFINITIONS
@@ -34,6 +60,12 @@ CATEGORIES = [
     'other'
 ]
 
+# Column of each category in the classification score matrix
+CATEGORY_INDEX = {cat: i for i, cat in enumerate(CATEGORIES)}
+_BASS, _LEAD, _PAD, _PLUCK, _DRUM, _AMBIENT = (
+    CATEGORY_INDEX[cat] for cat in ('bass', 'lead', 'pad', 'pluck', 'drum', 'ambient')
+)
+
 SUBCATEGORIES = {
     'bass': ['sub-bass', 'reese', 'growl', 'wobble', 'pluck-bass', 'fm-bass', 'acid-bass', 'generic-bass'],
     'lead': ['mono-lead', 'poly-lead', 'screech', 'acid-lead', 'saw-lead', 'square-lead', 'generic-lead'],
@@ -50,6 +82,11 @@ SUBCATEGORIES = {
     'other': ['generic']
 }
 
+# Owning category of each subcategory
+SUBCATEGORY_TO_CATEGORY = {
+    subcat: cat for cat, subcats in SUBCATEGORIES.items() for subcat in subcats
+}
+
 # Keyword patterns for classification
 CATEGORY_KEYWORDS = {
     'bass': [
@@ -133,25 +170,115 @@ SUBCATEGORY_KEYWORDS = {
     'soundscape': [r'\bsoundscape\b', r'\bcinematic\b', r'\bfilm\b'],
 }
 
+# Wavetable categories based on sound type
+WAVETABLE_KEYWORDS = {
+    'basic': [r'\bsine\b', r'\bsaw\b', r'\bsquare\b', r'\btriangle\b', r'\bpulse\b', r'\bbasic\b'],
+    'analog': [r'\banalog\b', r'\bvintage\b', r'\bclassic\b', r'\bwarm\b', r'\bfat\b'],
+    'digital': [r'\bdigital\b', r'\bfm\b', r'\bharmonic\b', r'\badditive\b', r'\bspectral\b'],
+    'vocal': [r'\bvocal\b', r'\bvoice\b', r'\bformant\b', r'\bchoir\b', r'\bvowel\b'],
+    'strings': [r'\bstring\b', r'\bcello\b', r'\bviolin\b', r'\borchestra\b'],
+    'keys': [r'\bpiano\b', r'\borgan\b', r'\bbell\b', r'\bmallet\b', r'\bclav\b'],
+    'brass': [r'\bbrass\b', r'\bhorn\b', r'\btrumpet\b'],
+    'noise': [r'\bnoise\b', r'\btexture\b', r'\bgrainy\b'],
+    'evolving': [r'\bevolv\b', r'\bmorph\b', r'\bsweep\b', r'\bmoving\b'],
+    'experimental': [r'\bglitch\b', r'\bweird\b', r'\bexperimental\b', r'\bcrazy\b'],
+}
+
+def compile_keywords(keywords: Dict[str, List[str]]) -> Dict[str, re.Pattern]:
+    """Fuse each keyword list into one alternation, one capture group per keyword."""
+    return {
+        key: re.compile('|'.join(f'({pattern})' for pattern in patterns))
+        for key, patterns in keywords.items()
+    }
+
+def compile_keyword_index(keywords: Dict[str, List[str]]) -> Tuple[re.Pattern, List[Tuple[str, ...]]]:
+    """Fuse every distinct keyword into one regex; group N maps to the keys listing it."""
+    owners: Dict[str, List[str]] = {}
+    for key, patterns in keywords.items():
+        for pattern in patterns:
+            owners.setdefault(pattern, []).append(key)
+    regex = re.compile('|'.join(f'({pattern})' for pattern in owners))
+    # Group numbers start at 1
+    return regex, [()] + [tuple(keys) for keys in owners.values()]
+
+CATEGORY_PATTERN, CATEGORY_GROUP_OWNERS = compile_keyword_index(CATEGORY_KEYWORDS)
+# Score-matrix columns for each regex group
+CATEGORY_GROUP_COLUMNS = [
+    [CATEGORY_INDEX[cat] for cat in owners] for owners in CATEGORY_GROUP_OWNERS
+]
+SUBCATEGORY_PATTERNS = compile_keywords(SUBCATEGORY_KEYWORDS)
+
+def index_keyword_words(keywords: Dict[str, List[str]]) -> Dict[str, Tuple[int, str]]:
+    """Map each single-word keyword to (listing order, key) of the first key listing it."""
+    words: Dict[str, Tuple[int, str]] = {}
+    for rank, (key, patterns) in enumerate(keywords.items()):
+        for pattern in patterns:
+            words.setdefault(pattern.replace(r'\b', ''), (rank, key))
+    return words
+
+# Every wavetable keyword is a single word, so matching reduces to looking up
+# the text's words; the lowest rank found is the first category that matches
+WAVETABLE_WORDS = index_keyword_words(WAVETABLE_KEYWORDS)
+WORD_RE = re.compile(r'\w+')
+
+# Literal text of every category/subcategory keyword; a search text containing
+# none of them can skip the regexes entirely
+KEYWORD_LITERALS = tuple({
+    pattern.replace(r'\b', '')
+    for keywords in (CATEGORY_KEYWORDS, SUBCATEGORY_KEYWORDS)
+    for patterns in keywords.values()
+    for pattern in patterns
+})
+# Keywords are all lower-case, so the patterns are compiled without
+# re.IGNORECASE and matched against lower-cased text. On such text
+# IGNORECASE also matched 'ı' as 'i' and 'ſ' as 's'; folding those two keeps
+# the case-sensitive patterns matching the same names.
+IGNORECASE_FOLDS = str.maketrans({'ı': 'i', 'ſ': 's'})
+
 # ============================================================================
 # CLASSIFICATION FUNCTIONS  
 # ============================================================================
 
-def classify_preset(name: str, original_category: str, oscillators_json: str, envelopes_json: str) -> Tuple[str, str]:
-    """Classify a preset into category and subcategory."""
-    search_text = f"{name} {original_category}".lower()
-    
-    # Score each category
-    scores = {cat: 0 for cat in CATEGORIES}
-    
-    for category, patterns in CATEGORY_KEYWORDS.items():
-        for pattern in patterns:
-            if re.search(pattern, search_text, re.IGNORECASE):
-                scores[category] += 2
-    
+def parse_json_list(text: Optional[str]) -> list:
+    """Parse a JSON list column; empty or malformed values give an empty list."""
+    if not text or text == '[]':
+        return []
+    try:
+        return loads_json(text)
+    except (ValueError, TypeError):
+        return []
+
+def make_search_text(name: str, original_category: str) -> str:
+    """Lower-cased, folded "name category" text that the keyword patterns match."""
+    return f"{name} {original_category}".lower().translate(IGNORECASE_FOLDS)
+
+@lru_cache(maxsize=8192)
+def keyword_profile(search_text: str) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Keyword score row (CATEGORY_INDEX columns) and matched subcategories for a search text.
+    
+    Cached, since presets within a pack share names and categories heavily;
+    the returned row is read-only.
+    """
+    scores = np.zeros(len(CATEGORIES), dtype=np.int32)
+    
+    if not any(literal in search_text for literal in KEYWORD_LITERALS):
+        scores.flags.writeable = False
+        return scores, ()
+    
+    # One scan over the text; each distinct keyword scores once, however often it repeats
+    hits = {match.lastindex for match in CATEGORY_PATTERN.finditer(search_text)}
+    columns = [column for group in hits for column in CATEGORY_GROUP_COLUMNS[group]]
+    np.add.at(scores, np.array(columns, dtype=np.intp), 2)
+    scores.flags.writeable = False
+    
+    subcats = tuple(subcat for subcat, pattern in SUBCATEGORY_PATTERNS.items()
+                    if pattern.search(search_text))
+    return scores, subcats
+
+def add_hint_scores(scores: np.ndarray, oscillators: list, envelopes: list):
+    """Add envelope and oscillator shape hints to one preset's score row."""
     # Analyze envelopes for hints
     try:
-        envelopes = json.loads(envelopes_json) if envelopes_json else []
         for env in envelopes:
             if env.get('name') in ['amp', 'env_1']:
                 attack = env.get('attack', 0)
@@ -161,84 +288,386 @@ def classify_preset(name: str, original_category: str, oscillators_json: str, en
                 
                 # Short attack + short decay + low sustain = pluck
                 if attack < 0.02 and decay < 0.3 and sustain < 0.3:
-                    scores['pluck'] += 2
+                    scores[CATEGORY_INDEX['pluck']] += 2
                 # Short attack + high sustain = lead/bass
                 if attack < 0.02 and sustain > 0.7:
-                    scores['lead'] += 1
-                    scores['bass'] += 1
+                    scores[CATEGORY_INDEX['lead']] += 1
+                    scores[CATEGORY_INDEX['bass']] += 1
                 # Long attack = pad
                 if attack > 0.1:
-                    scores['pad'] += 2
+                    scores[CATEGORY_INDEX['pad']] += 2
                 # Long release = pad/ambient
                 if release > 1:
-                    scores['pad'] += 1
-                    scores['ambient'] += 1
+                    scores[CATEGORY_INDEX['pad']] += 1
+                    scores[CATEGORY_INDEX['ambient']] += 1
                 # Very short everything = drum/perc
                 if attack < 0.01 and decay < 0.2 and sustain < 0.1:
-                    scores['drum'] += 2
-    except:
+                    scores[CATEGORY_INDEX['drum']] += 2
+    except (TypeError, AttributeError):
         pass
     
     # Analyze oscillators for hints
     try:
-        oscillators = json.loads(oscillators_json) if oscillators_json else []
         for osc in oscillators:
             if osc.get('unison_voices', 1) > 4:
-                scores['lead'] += 2
+                scores[CATEGORY_INDEX['lead']] += 2
             octave = osc.get('tune_semitones', 0) / 12 if osc.get('tune_semitones') else 0
             if octave <= -1:
-                scores['bass'] += 2
-    except:
+                scores[CATEGORY_INDEX['bass']] += 2
+    except (TypeError, AttributeError, OverflowError):
         pass
+
+def _number(value) -> float:
+    """float() of a JSON number; anything else raises TypeError."""
+    if type(value) not in (int, float, bool):
+        raise TypeError(f"not a number: {value!r}")
+    return float(value)
+
+def extract_hint_params(presets: List[Tuple[str, str, list, list]]):
+    """Flatten a batch's amp envelopes and oscillators into arrays for hint scoring.
+    
+    Returns (env_rows, env_params, osc_rows, osc_params, irregular); the rows
+    arrays give each entry's preset index. Presets with malformed envelopes or
+    oscillators are listed in irregular and left to add_hint_scores.
+    """
+    env_rows, env_params, osc_rows, osc_params, irregular = [], [], [], [], []
+    for i, (_, _, oscillators, envelopes) in enumerate(presets):
+        try:
+            envs = [
+                (_number(env.get('attack', 0)), _number(env.get('decay', 0)),
+                 _number(env.get('sustain', 1)), _number(env.get('release', 0)))
+                for env in envelopes if env.get('name') in ['amp', 'env_1']
+            ]
+            oscs = [
+                (_number(osc.get('unison_voices', 1)), _number(osc.get('tune_semitones') or 0))
+                for osc in oscillators
+            ]
+        except (TypeError, AttributeError, OverflowError):
+            irregular.append(i)
+            continue
+        env_rows.extend([i] * len(envs))
+        env_params.extend(envs)
+        osc_rows.extend([i] * len(oscs))
+        osc_params.extend(oscs)
+    
+    return (np.array(env_rows, dtype=np.int64), np.array(env_params, dtype=np.float64).reshape(-1, 4),
+            np.array(osc_rows, dtype=np.int64), np.array(osc_params, dtype=np.float64).reshape(-1, 2),
+            irregular)
+
+if njit is not None:
+    @njit(cache=True)
+    def _hint_kernel(scores, env_rows, env_params, osc_rows, osc_params):
+        for k in range(env_rows.shape[0]):
+            row = scores[env_rows[k]]
+            attack, decay, sustain, release = env_params[k, 0], env_params[k, 1], env_params[k, 2], env_params[k, 3]
+            if attack < 0.02 and decay < 0.3 and sustain < 0.3:
+                row[_PLUCK] += 2
+            if attack < 0.02 and sustain > 0.7:
+                row[_LEAD] += 1
+                row[_BASS] += 1
+            if attack > 0.1:
+                row[_PAD] += 2
+            if release > 1:
+                row[_PAD] += 1
+                row[_AMBIENT] += 1
+            if attack < 0.01 and decay < 0.2 and sustain < 0.1:
+                row[_DRUM] += 2
+        for k in range(osc_rows.shape[0]):
+            row = scores[osc_rows[k]]
+            if osc_params[k, 0] > 4:
+                row[_LEAD] += 2
+            if osc_params[k, 1] / 12 <= -1:
+                row[_BASS] += 2
+
+def score_hints(scores: np.ndarray, env_rows: np.ndarray, env_params: np.ndarray,
+                osc_rows: np.ndarray, osc_params: np.ndarray):
+    """Add the envelope/oscillator hints of add_hint_scores to a whole score matrix."""
+    if njit is not None:
+        _hint_kernel(scores, env_rows, env_params, osc_rows, osc_params)
+        return
+    
+    attack, decay, sustain, release = env_params.T
+    short_attack = attack < 0.02
+    for mask, column, points in (
+        (short_attack & (decay < 0.3) & (sustain < 0.3), _PLUCK, 2),
+        (short_attack & (sustain > 0.7), _LEAD, 1),
+        (short_attack & (sustain > 0.7), _BASS, 1),
+        (attack > 0.1, _PAD, 2),
+        (release > 1, _PAD, 1),
+        (release > 1, _AMBIENT, 1),
+        ((attack < 0.01) & (decay < 0.2) & (sustain < 0.1), _DRUM, 2),
+    ):
+        # add.at accumulates presets with several matching envelopes
+        np.add.at(scores, (env_rows[mask], column), points)
+    
+    unison, tune = osc_params.T
+    np.add.at(scores, (osc_rows[unison > 4], _LEAD), 2)
+    np.add.at(scores, (osc_rows[tune / 12 <= -1], _BASS), 2)
+
+def classify_presets(presets: List[Tuple[str, str, list, list]]) -> List[Tuple[str, str]]:
+    """Classify a batch of (name, original_category, oscillators, envelopes) presets.
+    
+    The batch is scored as one (presets x categories) matrix, so picking every
+    preset's best category is a single argmax.
+    """
+    profiles = [keyword_profile(make_search_text(name, original_category))
+                for name, original_category, _, _ in presets]
+    # Stacking copies the cached rows, so hints can be added in place
+    scores = np.array([keyword_scores for keyword_scores, _ in profiles],
+                      dtype=np.int32).reshape(len(presets), len(CATEGORIES))
+    
+    env_rows, env_params, osc_rows, osc_params, irregular = extract_hint_params(presets)
+    score_hints(scores, env_rows, env_params, osc_rows, osc_params)
+    for i in irregular:
+        _, _, oscillators, envelopes = presets[i]
+        add_hint_scores(scores[i], oscillators, envelopes)
+    
+    # Find best category; argmax keeps the first of tied categories
+    best = scores.argmax(axis=1)
+    best_scores = scores[np.arange(len(presets)), best]
+    
+    results = []
+    for (_, matched_subcats), best_index, best_score in zip(profiles, best.tolist(), best_scores.tolist()):
+        best_category = CATEGORIES[best_index] if best_score else 'other'
+        
+        # Determine subcategory
+        subcategory = f"generic-{best_category}" if best_category != 'other' else 'generic'
+        
+        # The last matching subcategory of our category wins
+        for subcat in matched_subcats:
+            if SUBCATEGORY_TO_CATEGORY.get(subcat) == best_category:
+                subcategory = subcat
+        
+        results.append((best_category, subcategory))
     
-    # Find best category
-    best_category = max(scores, key=lambda k: scores[k])
-    if scores[best_category] == 0:
-        best_category = 'other'
-    
-    # Determine subcategory
-    subcategory = f"generic-{best_category}" if best_category != 'other' else 'generic'
-    
-    for subcat, patterns in SUBCATEGORY_KEYWORDS.items():
-        for pattern in patterns:
-            if re.search(pattern, search_text, re.IGNORECASE):
-                # Check if this subcategory belongs to our category
-                for cat, subcats in SUBCATEGORIES.items():
-                    if subcat in subcats and cat == best_category:
-                        subcategory = subcat
+    return results
+
+def is_sqlite_value(value) -> bool:
+    """Whether sqlite3 can bind a parsed JSON value as a column value."""
+    if isinstance(value, int):
+        return -2**63 <= value < 2**63
+    return isinstance(value, (str, float))
+
+def intern_text(value):
+    """Intern a source column value when it is text; other values pass through."""
+    return intern(value) if type(value) is str else value
+
+def classify_batch(rows: List[Tuple[str, Optional[str], str, str, str]]) -> List[Tuple[str, str, list, list]]:
+    """Classify (name, category, oscillators, envelopes, tags) source rows in a worker process.
+    
+    Returns (category, subcategory, wavetable_refs, tags) per row, where
+    wavetable_refs holds (oscillator_index, wavetable_name) pairs and tags are
+    lower-cased.
+    """
+    # Parse once; classification and wavetable extraction share the result
+    presets = [
+        (name, category or '', parse_json_list(oscillators_json), parse_json_list(envelopes_json))
+        for name, category, oscillators_json, envelopes_json, _ in rows
+    ]
+    
+    results = []
+    for row, (_, _, oscillators, _), (category, subcategory) in zip(
+            rows, presets, classify_presets(presets)):
+        tags_json = row[4]
+        
+        # Extract wavetable references; a name sqlite3 can't store ends them
+        wavetable_refs = []
+        try:
+            for i, osc in enumerate(oscillators):
+                wt_name = osc.get('wavetable_name')
+                if wt_name:
+                    if not is_sqlite_value(wt_name):
                         break
+                    wavetable_refs.append((i, wt_name))
+        except (TypeError, AttributeError):
+            pass
+        
+        # Extract tags
+        tags = []
+        try:
+            for tag in parse_json_list(tags_json):
+                if tag:
+                    tags.append(tag.lower())
+        except (TypeError, AttributeError):
+            pass
+        
+        results.append((category, subcategory, wavetable_refs, tags))
     
-    return best_category, subcategory
+    return results
 
+@lru_cache(maxsize=8192)
 def classify_wavetable(name: str, original_category: str) -> str:
     """Classify a wavetable into a category."""
-    search_text = f"{name} {original_category}".lower()
-    
-    # Wavetable categories based on sound type
-    wt_categories = {
-        'basic': [r'\bsine\b', r'\bsaw\b', r'\bsquare\b', r'\btriangle\b', r'\bpulse\b', r'\bbasic\b'],
-        'analog': [r'\banalog\b', r'\bvintage\b', r'\bclassic\b', r'\bwarm\b', r'\bfat\b'],
-        'digital': [r'\bdigital\b', r'\bfm\b', r'\bharmonic\b', r'\badditive\b', r'\bspectral\b'],
-        'vocal': [r'\bvocal\b', r'\bvoice\b', r'\bformant\b', r'\bchoir\b', r'\bvowel\b'],
-        'strings': [r'\bstring\b', r'\bcello\b', r'\bviolin\b', r'\borchestra\b'],
-        'keys': [r'\bpiano\b', r'\borgan\b', r'\bbell\b', r'\bmallet\b', r'\bclav\b'],
-        'brass': [r'\bbrass\b', r'\bhorn\b', r'\btrumpet\b'],
-        'noise': [r'\bnoise\b', r'\btexture\b', r'\bgrainy\b'],
-        'evolving': [r'\bevolv\b', r'\bmorph\b', r'\bsweep\b', r'\bmoving\b'],
-        'experimental': [r'\bglitch\b', r'\bweird\b', r'\bexperimental\b', r'\bcrazy\b'],
-    }
+    search_text = make_search_text(name, original_category)
     
-    for category, patterns in wt_categories.items():
-        for pattern in patterns:
-            if re.search(pattern, search_text, re.IGNORECASE):
-                return category
+    matches = [WAVETABLE_WORDS[word] for word in WORD_RE.findall(search_text)
+               if word in WAVETABLE_WORDS]
     
-    return 'general'
+    return min(matches)[1] if matches else 'general'
 
 # ============================================================================
 # DATABASE OPERATIONS
 # ============================================================================
 
+# Rows buffered per executemany call during the bulk copy
+INSERT_BATCH_SIZE = 1000
+
+# Preset batches queued on the classification workers at once
+MAX_PENDING_BATCHES = 2 * (os.cpu_count() or 1)
+
+# Schema for the organized database; indexes are built after the bulk load
+SCHEMA_TABLES = '''
+    -- Instrument categories lookup
+    CREATE TABLE IF NOT EXISTS categories (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        description TEXT,
+        display_order INTEGER
+    );
+    
+    -- Subcategories
+    CREATE TABLE IF NOT EXISTS subcategories (
+        id TEXT PRIMARY KEY,
+        category_id TEXT NOT NULL,
+        name TEXT NOT NULL,
+        display_order INTEGER,
+        FOREIGN KEY (category_id) REFERENCES categories(id)
+    );
+    
+    -- Wavetables organized by sound type
+    CREATE TABLE IF NOT EXISTS wavetables (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        sound_category TEXT,  -- basic, analog, digital, vocal, etc.
+        original_source TEXT,  -- surge or vital
+        original_category TEXT,
+        path TEXT,
+        frame_count INTEGER,
+        frame_size INTEGER,
+        sample_rate INTEGER DEFAULT 44100,
+        is_third_party INTEGER DEFAULT 0,
+        contributor TEXT,
+        data_b64 TEXT,
+        sample_scale REAL,  -- set when data_b64 holds int16 samples
+        data BLOB,  -- raw float32 samples, from sources that store a BLOB
+        sha256 TEXT,
+        file_size INTEGER
+    );
+    
+    -- Presets organized by instrument type
+    CREATE TABLE IF NOT EXISTS presets (
+        id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        category_id TEXT NOT NULL,
+        subcategory_id TEXT,
+        original_source TEXT,  -- surge or vital
+        original_category TEXT,
+        path TEXT,
+        author TEXT,
+        description TEXT,
+        tags TEXT,
+        
+        -- Unified preset data (JSON)
+        oscillators TEXT,
+        filters TEXT,
+        envelopes TEXT,
+        lfos TEXT,
+        modulations TEXT,
+        effects TEXT,
+        
+        -- Global settings
+        master_volume REAL DEFAULT 1.0,
+        polyphony INTEGER DEFAULT 16,
+        portamento REAL DEFAULT 0.0,
+        
+        -- Metadata
+        sha256 TEXT,
+        file_size INTEGER,
+        
+        FOREIGN KEY (category_id) REFERENCES categories(id),
+        FOREIGN KEY (subcategory_id) REFERENCES subcategories(id)
+    );
+    
+    -- Wavetable references in presets
+    CREATE TABLE IF NOT EXISTS preset_wavetables (
+        preset_id TEXT,
+        wavetable_name TEXT,
+        oscillator_index INTEGER,
+        PRIMARY KEY (preset_id, oscillator_index),
+        FOREIGN KEY (preset_id) REFERENCES presets(id)
+    );
+    
+    -- Tags for filtering
+    CREATE TABLE IF NOT EXISTS preset_tags (
+        preset_id TEXT,
+        tag TEXT,
+        PRIMARY KEY (preset_id, tag),
+        FOREIGN KEY (preset_id) REFERENCES presets(id)
+    );
+'''
+
+SCHEMA_INDEXES = '''
+    CREATE INDEX IF NOT EXISTS idx_wavetables_category ON wavetables(sound_category);
+    CREATE INDEX IF NOT EXISTS idx_presets_category ON presets(category_id);
+    CREATE INDEX IF NOT EXISTS idx_presets_subcategory ON presets(subcategory_id);
+    CREATE INDEX IF NOT EXISTS idx_preset_tags ON preset_tags(tag);
+'''
+
+# Indexes left over from a previous run are dropped before loading
+DROP_INDEXES = '''
+    DROP INDEX IF EXISTS main.idx_wavetables_category;
+    DROP INDEX IF EXISTS main.idx_presets_category;
+    DROP INDEX IF EXISTS main.idx_presets_subcategory;
+    DROP INDEX IF EXISTS main.idx_preset_tags;
+'''
+
+INSERT_CATEGORY_SQL = 'INSERT OR REPLACE INTO categories (id, name, display_order) VALUES (?, ?, ?)'
+
+INSERT_SUBCATEGORY_SQL = '''
+    INSERT OR REPLACE INTO subcategories (id, category_id, name, display_order)
+    VALUES (?, ?, ?, ?)
+'''
+
+# {data_b64}, {sample_scale} and {data} are source columns, or NULL for
+# sources without them
+COPY_WAVETABLES_SQL = '''
+    INSERT OR REPLACE INTO wavetables 
+    (id, name, sound_category, original_source, original_category, path,
+     frame_count, frame_size, sample_rate, is_third_party, contributor,
+     data_b64, sample_scale, data, sha256, file_size)
+    SELECT w.id, w.name, c.sound_category, w.source, c.original_category, w.path,
+           w.frame_count, w.frame_size, w.sample_rate, w.is_third_party, w.contributor,
+           {data_b64}, {sample_scale}, {data}, w.sha256, w.file_size
+    FROM src.wavetables AS w
+    JOIN temp.wavetable_classes AS c ON c.src_rowid = w.rowid
+    ORDER BY w.rowid
+'''
+
+SELECT_PRESETS_SQL = '''
+    SELECT id, name, source, category, path, author, description, tags,
+           oscillators, filters, envelopes, lfos, modulations, effects,
+           master_volume, polyphony, portamento, sha256, file_size
+    FROM presets
+'''
+
+INSERT_PRESET_SQL = '''
+    INSERT OR REPLACE INTO presets
+    (id, name, category_id, subcategory_id, original_source, original_category,
+     path, author, description, tags, oscillators, filters, envelopes,
+     lfos, modulations, effects, master_volume, polyphony, portamento,
+     sha256, file_size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+INSERT_PRESET_WAVETABLE_SQL = '''
+    INSERT OR REPLACE INTO preset_wavetables (preset_id, wavetable_name, oscillator_index)
+    VALUES (?, ?, ?)
+'''
+
+INSERT_PRESET_TAG_SQL = 'INSERT OR REPLACE INTO preset_tags (preset_id, tag) VALUES (?, ?)'
+
+INSERT_METADATA_SQL = 'INSERT OR REPLACE INTO metadata VALUES (?, ?)'
+
 def create_organized_database(input_db: str, output_db: str):
     """Create a new database organized by instrument type."""
     
@@ -247,219 +676,137 @@ def create_organized_database(input_db: str, output_db: str):
     
     # Connect to source database
     src_conn = sqlite3.connect(input_db)
-    src_conn.row_factory = sqlite3.Row
     
-    # Create destination database
-    dst_conn = sqlite3.connect(output_db)
+    # Create destination database; transactions are managed explicitly
+    dst_conn = sqlite3.connect(output_db, isolation_level=None)
     dst_cursor = dst_conn.cursor()
     
+    # Bulk-load settings; the journal is switched back before closing
+    dst_cursor.execute('PRAGMA journal_mode=WAL')
+    dst_cursor.execute('PRAGMA synchronous=NORMAL')
+    dst_cursor.execute('PRAGMA temp_store=MEMORY')
+    dst_cursor.execute('PRAGMA cache_size=-65536')
+    
+    # Wavetable rows are copied straight from the source inside SQLite
+    dst_cursor.execute('ATTACH DATABASE ? AS src', (input_db,))
+    
     # Create schema for organized database
-    dst_cursor.executescript('''
-        -- Instrument categories lookup
-        CREATE TABLE IF NOT EXISTS categories (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            description TEXT,
-            display_order INTEGER
-        );
-        
-        -- Subcategories
-        CREATE TABLE IF NOT EXISTS subcategories (
-            id TEXT PRIMARY KEY,
-            category_id TEXT NOT NULL,
-            name TEXT NOT NULL,
-            display_order INTEGER,
-            FOREIGN KEY (category_id) REFERENCES categories(id)
-        );
-        
-        -- Wavetables organized by sound type
-        CREATE TABLE IF NOT EXISTS wavetables (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            sound_category TEXT,  -- basic, analog, digital, vocal, etc.
-            original_source TEXT,  -- surge or vital
-            original_category TEXT,
-            path TEXT,
-            frame_count INTEGER,
-            frame_size INTEGER,
-            sample_rate INTEGER DEFAULT 44100,
-            is_third_party INTEGER DEFAULT 0,
-            contributor TEXT,
-            data_b64 TEXT,
-            sha256 TEXT,
-            file_size INTEGER
-        );
-        
-        -- Presets organized by instrument type
-        CREATE TABLE IF NOT EXISTS presets (
-            id TEXT PRIMARY KEY,
-            name TEXT NOT NULL,
-            category_id TEXT NOT NULL,
-            subcategory_id TEXT,
-            original_source TEXT,  -- surge or vital
-            original_category TEXT,
-            path TEXT,
-            author TEXT,
-            description TEXT,
-            tags TEXT,
-            
-            -- Unified preset data (JSON)
-            oscillators TEXT,
-            filters TEXT,
-            envelopes TEXT,
-            lfos TEXT,
-            modulations TEXT,
-            effects TEXT,
-            
-            -- Global settings
-            master_volume REAL DEFAULT 1.0,
-            polyphony INTEGER DEFAULT 16,
-            portamento REAL DEFAULT 0.0,
-            
-            -- Metadata
-            sha256 TEXT,
-            file_size INTEGER,
-            
-            FOREIGN KEY (category_id) REFERENCES categories(id),
-            FOREIGN KEY (subcategory_id) REFERENCES subcategories(id)
-        );
-        
-        -- Wavetable references in presets
-        CREATE TABLE IF NOT EXISTS preset_wavetables (
-            preset_id TEXT,
-            wavetable_name TEXT,
-            oscillator_index INTEGER,
-            PRIMARY KEY (preset_id, oscillator_index),
-            FOREIGN KEY (preset_id) REFERENCES presets(id)
-        );
-        
-        -- Tags for filtering
-        CREATE TABLE IF NOT EXISTS preset_tags (
-            preset_id TEXT,
-            tag TEXT,
-            PRIMARY KEY (preset_id, tag),
-            FOREIGN KEY (preset_id) REFERENCES presets(id)
-        );
-        
-        -- Indexes
-        CREATE INDEX IF NOT EXISTS idx_wavetables_category ON wavetables(sound_category);
-        CREATE INDEX IF NOT EXISTS idx_presets_category ON presets(category_id);
-        CREATE INDEX IF NOT EXISTS idx_presets_subcategory ON presets(subcategory_id);
-        CREATE INDEX IF NOT EXISTS idx_preset_tags ON preset_tags(tag);
-    ''')
+    dst_cursor.executescript(SCHEMA_TABLES)
+    dst_cursor.executescript(DROP_INDEXES)
+    
+    # Databases built before sample_scale existed need the column added
+    wt_columns = {row[1] for row in dst_cursor.execute('PRAGMA table_info(wavetables)')}
+    if 'sample_scale' not in wt_columns:
+        dst_cursor.execute('ALTER TABLE wavetables ADD COLUMN sample_scale REAL')
+    if 'data' not in wt_columns:
+        dst_cursor.execute('ALTER TABLE wavetables ADD COLUMN data BLOB')
+    
+    # Everything from here to the metadata lands in one transaction
+    dst_cursor.execute('BEGIN')
     
     # Insert categories
-    for i, cat in enumerate(CATEGORIES):
-        dst_cursor.execute(
-            'INSERT OR REPLACE INTO categories (id, name, display_order) VALUES (?, ?, ?)',
-            (cat, cat.title(), i)
-        )
+    dst_cursor.executemany(
+        INSERT_CATEGORY_SQL,
+        [(cat, cat.title(), i) for i, cat in enumerate(CATEGORIES)]
+    )
     
     # Insert subcategories
-    for cat, subcats in SUBCATEGORIES.items():
-        for i, subcat in enumerate(subcats):
-            dst_cursor.execute(
-                'INSERT OR REPLACE INTO subcategories (id, category_id, name, display_order) VALUES (?, ?, ?, ?)',
-                (subcat, cat, subcat.replace('-', ' ').title(), i)
-            )
-    
-    dst_conn.commit()
+    dst_cursor.executemany(
+        INSERT_SUBCATEGORY_SQL,
+        [(subcat, cat, subcat.replace('-', ' ').title(), i)
+         for cat, subcats in SUBCATEGORIES.items()
+         for i, subcat in enumerate(subcats)]
+    )
     
     # Process wavetables
     print("\nProcessing wavetables...")
     src_cursor = src_conn.cursor()
-    src_cursor.execute('SELECT * FROM wavetables')
-    
-    wt_count = 0
-    for row in src_cursor:
-        name = row['name']
-        original_category = row['category'] or ''
-        sound_category = classify_wavetable(name, original_category)
-        
-        dst_cursor.execute('''
-            INSERT OR REPLACE INTO wavetables 
-            (id, name, sound_category, original_source, original_category, path,
-             frame_count, frame_size, sample_rate, is_third_party, contributor,
-             data_b64, sha256, file_size)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            row['id'], name, sound_category, row['source'], original_category,
-            row['path'], row['frame_count'], row['frame_size'], row['sample_rate'],
-            row['is_third_party'], row['contributor'], row['data_b64'],
-            row['sha256'], row['file_size']
-        ))
-        wt_count += 1
     
+    # Sample columns the source doesn't have read as NULL: sample_scale is
+    # newer than data_b64, and downloader databases store a data BLOB instead
+    src_wt_columns = {row[1] for row in src_cursor.execute('PRAGMA table_info(wavetables)')}
+    sample_columns = {
+        column: f'w.{column}' if column in src_wt_columns else 'NULL'
+        for column in ('data_b64', 'sample_scale', 'data')
+    }
+    # Newer downloader databases keep each distinct payload in wavetable_blobs
+    if src_cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'wavetable_blobs'").fetchone():
+        sample_columns['data'] = (
+            f"COALESCE((SELECT b.data FROM src.wavetable_blobs AS b WHERE b.sha256 = w.sha256), "
+            f"{sample_columns['data']})"
+        )
+
+    # Only names and categories pass through Python; the sample data is
+    # copied inside SQLite from the attached source below
+    dst_cursor.execute('''
+        CREATE TEMP TABLE wavetable_classes (
+            src_rowid INTEGER PRIMARY KEY,
+            original_category TEXT,
+            sound_category TEXT
+        )
+    ''')
+    classes = []
+    for rowid, name, category in src_cursor.execute('SELECT rowid, name, category FROM wavetables'):
+        original_category = category or ''
+        classes.append((rowid, original_category, classify_wavetable(name, original_category)))
+    dst_cursor.executemany('INSERT INTO temp.wavetable_classes VALUES (?, ?, ?)', classes)
+    
+    dst_cursor.execute(COPY_WAVETABLES_SQL.format(**sample_columns))
+    wt_count = len(classes)
+    dst_cursor.execute('DROP TABLE temp.wavetable_classes')
     print(f"  Processed {wt_count} wavetables")
-    dst_conn.commit()
     
     # Process presets
     print("\nProcessing presets...")
-    src_cursor.execute('SELECT * FROM presets')
+    src_cursor.execute(SELECT_PRESETS_SQL)
     
     preset_count = 0
     category_counts = {cat: 0 for cat in CATEGORIES}
     
-    for row in src_cursor:
-        name = row['name']
-        original_category = row['category'] or ''
-        oscillators = row['oscillators'] or '[]'
-        envelopes = row['envelopes'] or '[]'
-        
-        # Classify
-        category, subcategory = classify_preset(name, original_category, oscillators, envelopes)
-        category_counts[category] += 1
-        
-        dst_cursor.execute('''
-            INSERT OR REPLACE INTO presets
-            (id, name, category_id, subcategory_id, original_source, original_category,
-             path, author, description, tags, oscillators, filters, envelopes,
-             lfos, modulations, effects, master_volume, polyphony, portamento,
-             sha256, file_size)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            row['id'], name, category, subcategory, row['source'], original_category,
-            row['path'], row['author'], row['description'], row['tags'],
-            row['oscillators'], row['filters'], row['envelopes'], row['lfos'],
-            row['modulations'], row['effects'], row['master_volume'],
-            row['polyphony'], row['portamento'], row['sha256'], row['file_size']
-        ))
-        
-        # Extract wavetable references
-        try:
-            oscs = json.loads(oscillators)
-            for i, osc in enumerate(oscs):
-                wt_name = osc.get('wavetable_name')
-                if wt_name:
-                    dst_cursor.execute('''
-                        INSERT OR REPLACE INTO preset_wavetables
-                        (preset_id, wavetable_name, oscillator_index)
-                        VALUES (?, ?, ?)
-                    ''', (row['id'], wt_name, i))
-        except:
-            pass
+    def write_batch(rows: List[tuple], classified: List[tuple]):
+        preset_batch = []
+        wavetable_batch = []
+        tag_batch = []
+        for row, (category, subcategory, wavetable_refs, tags) in zip(rows, classified):
+            preset_id = row[0]
+            category_counts[category] += 1
+            
+            # Short repeated strings are interned so buffered rows share one copy;
+            # columns from path onwards are copied in source order
+            preset_batch.append(
+                (preset_id, row[1], intern(category), intern(subcategory),
+                 intern_text(row[2]), intern_text(row[3] or '')) + row[4:]
+            )
+            
+            wavetable_batch.extend((preset_id, wt_name, i) for i, wt_name in wavetable_refs)
+            tag_batch.extend((preset_id, intern(tag)) for tag in tags)
         
-        # Extract tags
-        try:
-            tags = json.loads(row['tags'] or '[]')
-            for tag in tags:
-                if tag:
-                    dst_cursor.execute('''
-                        INSERT OR REPLACE INTO preset_tags (preset_id, tag)
-                        VALUES (?, ?)
-                    ''', (row['id'], tag.lower()))
-        except:
-            pass
+        dst_cursor.executemany(INSERT_PRESET_SQL, preset_batch)
+        dst_cursor.executemany(INSERT_PRESET_WAVETABLE_SQL, wavetable_batch)
+        dst_cursor.executemany(INSERT_PRESET_TAG_SQL, tag_batch)
+    
+    # Workers parse and classify batches while this process writes earlier ones
+    with ProcessPoolExecutor() as executor:
+        pending = deque()
+        for rows in iter(lambda: src_cursor.fetchmany(INSERT_BATCH_SIZE), []):
+            work = [(row[1], row[3], row[8], row[10], row[7]) for row in rows]
+            pending.append((rows, executor.submit(classify_batch, work)))
+            preset_count += len(rows)
+            
+            if len(pending) >= MAX_PENDING_BATCHES:
+                rows, future = pending.popleft()
+                write_batch(rows, future.result())
         
-        preset_count += 1
+        while pending:
+            rows, future = pending.popleft()
+            write_batch(rows, future.result())
     
     print(f"  Processed {preset_count} presets")
     print("\n  Category distribution:")
     for cat, count in sorted(category_counts.items(), key=lambda x: -x[1]):
         print(f"    {cat}: {count}")
     
-    dst_conn.commit()
-    
     # Add metadata
     dst_cursor.execute('''
         CREATE TABLE IF NOT EXISTS metadata (
@@ -469,16 +816,19 @@ def create_organized_database(input_db: str, output_db: str):
     ''')
     
     import datetime
-    dst_cursor.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
-                       ('last_updated', datetime.datetime.now().isoformat()))
-    dst_cursor.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
-                       ('total_wavetables', str(wt_count)))
-    dst_cursor.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
-                       ('total_presets', str(preset_count)))
-    dst_cursor.execute('INSERT OR REPLACE INTO metadata VALUES (?, ?)',
-                       ('version', '2.0.0'))
-    
-    dst_conn.commit()
+    dst_cursor.executemany(INSERT_METADATA_SQL, [
+        ('last_updated', datetime.datetime.now().isoformat()),
+        ('total_wavetables', str(wt_count)),
+        ('total_presets', str(preset_count)),
+        ('version', '2.0.0'),
+    ])
+    
+    dst_cursor.execute('COMMIT')
+    
+    # Build the indexes in one pass over the loaded tables
+    dst_cursor.executescript(SCHEMA_INDEXES)
+    dst_cursor.execute('DETACH DATABASE src')
+    dst_cursor.execute('PRAGMA journal_mode=DELETE')
     
     # Close connections
     src_conn.close()
@@ -16,19 +16,77 @@ import os
 import sys
 import json
 import gzip
+import zlib
 import struct
 import sqlite3
 import hashlib
+import time
 import argparse
+import threading
+import multiprocessing
+import http.client
 import urllib.request
 import urllib.error
+import urllib.parse
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict, field
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, fields
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from collections import deque
+from functools import lru_cache
+from operator import attrgetter
 import base64
+import io
 import re
-import xml.etree.ElementTree as ET
+
+import numpy as np
+
+# numba is optional; it JIT-compiles the 24-bit WAV decode kernel
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# orjson is optional; it parses and serializes the preset JSON several times faster
+try:
+    import orjson
+    
+    def loads_json(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # json also accepts NaN/Infinity literals and UTF-16/32 input
+            return json.loads(data)
+    
+    def dumps_json(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode()
+        except orjson.JSONEncodeError:
+            # orjson can't serialize integers wider than 64 bits
+            return json.dumps(obj)
+except ImportError:
+    loads_json = json.loads
+    dumps_json = json.dumps
+
+# lxml is optional; its libxml2 parser is several times faster than ElementTree
+try:
+    from lxml import etree as ET
+    
+    # lxml rejects str input that carries an encoding declaration, so parse
+    # the UTF-8 bytes and ignore the declared encoding like ElementTree does
+    _XML_PARSER = ET.XMLParser(encoding='utf-8')
+    
+    def parse_xml(xml_str: str):
+        return ET.fromstring(xml_str.encode(), _XML_PARSER)
+except ImportError:
+    import xml.etree.ElementTree as ET
+    parse_xml = ET.fromstring
+
+# tqdm is optional; it replaces the per-file status lines with a progress bar
+try:
+    from tqdm import tqdm
+except ImportError:
+    tqdm = None
 
 # ============================================================================
 # CONFIGURATION
@@ -57,11 +115,29 @@ GITHUB_HEADERS = {
 MAX_CONCURRENT_DOWNLOADS = 5
 REQUEST_DELAY = 0.1  # seconds between requests
 
+HTTP_TIMEOUT = 30  # seconds
+MAX_REDIRECTS = 5
+
+# Retries of a rate-limited request, and the first backoff when GitHub sends no reset time
+RATE_LIMIT_RETRIES = 3
+RATE_LIMIT_BACKOFF = 60  # seconds, doubled per retry
+
+# Downloaded files allowed to wait on the parser processes before downloading pauses
+MAX_PENDING_PARSES = 2 * (os.cpu_count() or 1)
+
+# Precompiled struct formats for header and chunk fields
+_U32_LE = struct.Struct('<I')
+_U32_BE = struct.Struct('>I')
+_WT_HEADER = struct.Struct('<II')
+_WT_HEADER_FLAGS = struct.Struct('<III')
+_CHUNK_HDR = struct.Struct('<4sI')
+_FMT_HDR = struct.Struct('<HHIIHH')
+
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class WavetableData:
     """Parsed wavetable data."""
     id: str
@@ -75,12 +151,12 @@ class WavetableData:
     bit_depth: int = 32
     is_third_party: bool = False
     contributor: Optional[str] = None
-    # Actual waveform data stored as base64-encoded float32 array
-    data_b64: Optional[str] = None
+    # Actual waveform data as raw little-endian float32 samples
+    data: Optional[bytes] = None
     sha256: Optional[str] = None
     file_size: int = 0
     
-@dataclass
+@dataclass(slots=True)
 class OscillatorData:
     """Oscillator settings from a preset."""
     index: int  # 0, 1, 2 for osc1, osc2, osc3
@@ -103,7 +179,7 @@ class OscillatorData:
     # Extra params as JSON
     extra_params: str = "{}"
 
-@dataclass
+@dataclass(slots=True)
 class FilterData:
     """Filter settings from a preset."""
     index: int
@@ -117,7 +193,7 @@ class FilterData:
     env_depth: float = 0.0
     extra_params: str = "{}"
 
-@dataclass
+@dataclass(slots=True)
 class EnvelopeData:
     """Envelope settings."""
     name: str  # 'amp', 'filter', 'mod1', etc.
@@ -129,7 +205,7 @@ class EnvelopeData:
     decay_curve: float = 0.0
     release_curve: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class LFOData:
     """LFO settings."""
     index: int
@@ -143,7 +219,7 @@ class LFOData:
     delay: float = 0.0
     fade_in: float = 0.0
 
-@dataclass
+@dataclass(slots=True)
 class ModulationData:
     """Modulation routing."""
     source: str
@@ -151,7 +227,7 @@ class ModulationData:
     amount: float
     bipolar: bool = True
 
-@dataclass 
+@dataclass(slots=True)
 class EffectData:
     """Effect settings."""
     effect_type: str
@@ -159,7 +235,7 @@ class EffectData:
     mix: float = 1.0
     params: str = "{}"  # JSON params
 
-@dataclass
+@dataclass(slots=True)
 class PresetData:
     """Complete preset data."""
     id: str
@@ -192,36 +268,209 @@ class PresetData:
     sha256: Optional[str] = None
     file_size: int = 0
 
+@lru_cache(maxsize=None)
+def _record_fields(cls) -> Tuple[Tuple[str, ...], attrgetter]:
+    names = tuple(f.name for f in fields(cls))
+    return names, attrgetter(*names)
+
+def record_to_dict(record) -> Dict[str, Any]:
+    """Dict of a dataclass record's fields, in field order.
+    
+    Unlike dataclasses.asdict this doesn't recurse or deep-copy; the parsed
+    records only hold flat values.
+    """
+    names, getter = _record_fields(type(record))
+    return dict(zip(names, getter(record)))
+
 # ============================================================================
 # GITHUB API HELPERS
 # ============================================================================
 
-def github_request(url: str, headers: Optional[Dict] = None) -> bytes:
-    """Make a GitHub API request with error handling."""
-    req_headers = {**GITHUB_HEADERS, **(headers or {})}
+class HttpCache:
+    """ETag/Last-Modified validators kept in the http_cache table.
+    
+    Requests made with a cache are conditional, and a 304 Not Modified reply
+    surfaces as an HTTPError with code 304. Validators are only saved for a
+    URL once keep() is called for it, so a file whose parse failed is fetched
+    again next run. With refresh, requests are sent unconditionally, so every
+    file is parsed again (after a parser fix, say) and its validators renewed.
+    Everything except flush() is safe from download threads.
+    """
+    
+    def __init__(self, conn: sqlite3.Connection, refresh: bool = False):
+        self.conn = conn
+        self.refresh = refresh
+        self.entries = {
+            url: (etag, last_modified, body)
+            for url, etag, last_modified, body
+            in conn.execute('SELECT url, etag, last_modified, body FROM http_cache')
+        }
+        self.received: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self.updates: List[Tuple] = []
+    
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for url, if it was seen before."""
+        if self.refresh:
+            return {}
+        etag, last_modified, _ = self.entries.get(url, (None, None, None))
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers
+    
+    def cached_body(self, url: str) -> Optional[bytes]:
+        return self.entries.get(url, (None, None, None))[2]
+    
+    def receive(self, url: str, response_headers):
+        self.received[url] = (response_headers.get('ETag'), response_headers.get('Last-Modified'))
+    
+    def keep(self, url: str, body: Optional[bytes] = None):
+        """Save the validators last received for url, with body if a 304 needs it back."""
+        validators = self.received.pop(url, None)
+        if validators and any(validators):
+            self.updates.append((url, *validators, body))
+    
+    def flush(self):
+        with self.conn:
+            self.conn.executemany(UPSERT_HTTP_CACHE_SQL, self.updates)
+        self.updates = []
+
+UPSERT_HTTP_CACHE_SQL = '''
+    INSERT INTO http_cache (url, etag, last_modified, body) VALUES (?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        etag = excluded.etag, last_modified = excluded.last_modified, body = excluded.body
+'''
+
+class _ThreadConnections(threading.local):
+    """Keep-alive connections of the current thread, by (scheme, host)."""
+    
+    def __init__(self):
+        self.connections: Dict[Tuple[str, str], http.client.HTTPConnection] = {}
+
+_thread_connections = _ThreadConnections()
+
+def _open_connection(scheme: str, netloc: str) -> http.client.HTTPConnection:
+    if scheme == 'https':
+        return http.client.HTTPSConnection(netloc, timeout=HTTP_TIMEOUT)
+    return http.client.HTTPConnection(netloc, timeout=HTTP_TIMEOUT)
+
+def http_get(url: str, headers: Dict[str, str]) -> Tuple[http.client.HTTPMessage, bytes]:
+    """GET url, returning the response headers and body.
+    
+    Each download thread keeps one connection open per host, so a run pays
+    for a TLS handshake per thread rather than per file. Redirects are
+    followed, and any other status outside 2xx is raised as an HTTPError,
+    as urlopen does. Proxied hosts go through urlopen instead.
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urllib.parse.urlsplit(url)
+        proxies = urllib.request.getproxies()
+        if parts.scheme in proxies and not urllib.request.proxy_bypass(parts.hostname or ''):
+            request = urllib.request.Request(url, headers=headers)
+            with urllib.request.urlopen(request, timeout=HTTP_TIMEOUT) as response:
+                return response.headers, response.read()
+        
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        key = (parts.scheme, parts.netloc)
+        connections = _thread_connections.connections
+        
+        # The server may have dropped an idle connection; retry once on a fresh one
+        for attempt in range(2):
+            conn = connections.get(key)
+            if conn is None:
+                conn = connections[key] = _open_connection(*key)
+            try:
+                conn.request('GET', target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+                break
+            except (http.client.HTTPException, ConnectionError):
+                conn.close()
+                del connections[key]
+                if attempt:
+                    raise
+        if response.will_close:
+            conn.close()
+            del connections[key]
+        
+        location = response.headers.get('Location')
+        if response.status in (301, 302, 303, 307, 308) and location:
+            url = urllib.parse.urljoin(url, location)
+            continue
+        if not 200 <= response.status < 300:
+            raise urllib.error.HTTPError(url, response.status, response.reason,
+                                         response.headers, io.BytesIO(body))
+        return response.headers, body
+    
+    raise urllib.error.HTTPError(url, response.status, 'Too many redirects',
+                                 response.headers, io.BytesIO(body))
+
+def rate_limit_wait(error: urllib.error.HTTPError, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a rate-limited request, or None if it wasn't one."""
+    if error.code not in (403, 429):
+        return None
+    retry_after = error.headers.get('Retry-After', '')
+    if retry_after.isdigit():
+        return float(retry_after)
+    reset = error.headers.get('X-RateLimit-Reset', '')
+    if error.headers.get('X-RateLimit-Remaining') == '0' and reset.isdigit():
+        return max(int(reset) - time.time(), 0) + 1
+    if error.code == 429:
+        return RATE_LIMIT_BACKOFF * 2 ** attempt
+    return None
+
+def github_request(url: str, headers: Optional[Dict] = None,
+                   cache: Optional[HttpCache] = None) -> bytes:
+    """Make a GitHub API request with error handling.
+    
+    A rate-limited request waits for the time GitHub asks for (Retry-After,
+    or X-RateLimit-Reset once the quota is used up) and is then retried.
+    """
+    req_headers = {**GITHUB_HEADERS, **(cache.request_headers(url) if cache else {}), **(headers or {})}
     
     # Add token if available
     token = os.environ.get('GITHUB_TOKEN')
     if token:
-        req_headers['Authorization'] = f'token {token}'
-    
-    request = urllib.request.Request(url, headers=req_headers)
+        req_headers['Authorization'] = f'Bearer {token}'
     
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            response_headers, data = http_get(url, req_headers)
+            if cache is not None:
+                cache.receive(url, response_headers)
+            return data
+        except urllib.error.HTTPError as e:
+            wait = rate_limit_wait(e, attempt)
+            if wait is None or attempt == RATE_LIMIT_RETRIES:
+                if e.code in (403, 429) and not token:
+                    print(f"Rate limited. Set GITHUB_TOKEN env var for higher limits.")
+                raise
+            print(f"Rate limited; retrying {url} in {wait:.0f}s")
+            time.sleep(wait)
+
+def github_json(url: str, cache: Optional[HttpCache] = None) -> Any:
+    """Fetch a GitHub API JSON response, reusing the cached body on 304 Not Modified."""
     try:
-        with urllib.request.urlopen(request, timeout=30) as response:
-            return response.read()
+        data = github_request(url, cache=cache)
+        if cache is not None:
+            cache.keep(url, data)
     except urllib.error.HTTPError as e:
-        if e.code == 403:
-            print(f"Rate limited. Set GITHUB_TOKEN env var for higher limits.")
-        raise
+        if e.code != 304 or cache is None or cache.cached_body(url) is None:
+            raise
+        data = cache.cached_body(url)
+    return json.loads(data)
 
-def list_github_directory(api_url: str, path: str = "") -> List[Dict]:
+def list_github_directory(api_url: str, path: str = "",
+                          cache: Optional[HttpCache] = None) -> List[Dict]:
     """List contents of a GitHub directory recursively."""
     full_url = f"{api_url}/{path}" if path else api_url
     
     try:
-        data = github_request(full_url)
-        items = json.loads(data)
+        items = github_json(full_url, cache)
         
         if not isinstance(items, list):
             return []
@@ -232,7 +481,7 @@ def list_github_directory(api_url: str, path: str = "") -> List[Dict]:
                 results.append(item)
             elif item['type'] == 'dir':
                 # Recurse into subdirectories
-                sub_items = list_github_directory(api_url, item['path'])
+                sub_items = list_github_directory(api_url, item['path'], cache)
                 results.extend(sub_items)
                 
         return results
@@ -240,10 +489,52 @@ def list_github_directory(api_url: str, path: str = "") -> List[Dict]:
         print(f"Error listing {full_url}: {e}")
         return []
 
-def download_file(url: str) -> Optional[bytes]:
-    """Download a file from URL."""
+def list_github_paths(repo: str, branch: str, paths: List[str],
+                      cache: Optional[HttpCache] = None) -> Dict[str, List[Dict]]:
+    """List the files under each of paths with one recursive git trees call.
+    
+    Entries have the same keys as list_github_directory's. An empty path
+    means the whole repository. If the tree can't be fetched or comes back
+    truncated, each path is walked through the contents API instead.
+    """
+    api_base = f"https://api.github.com/repos/{repo}"
     try:
-        return github_request(url)
+        tree = github_json(f"{api_base}/git/trees/{branch}?recursive=1", cache)
+    except Exception as e:
+        print(f"Error listing tree of {repo}: {e}")
+        tree = None
+    
+    if not isinstance(tree, dict) or tree.get('truncated'):
+        return {path: list_github_directory(f"{api_base}/contents", path, cache) for path in paths}
+    
+    raw_base = f"https://raw.githubusercontent.com/{repo}/{branch}"
+    files = [
+        {
+            'type': 'file',
+            'name': entry['path'].rsplit('/', 1)[-1],
+            'path': entry['path'],
+            'download_url': f"{raw_base}/{urllib.parse.quote(entry['path'])}",
+        }
+        for entry in tree.get('tree', [])
+        if entry.get('type') == 'blob'
+    ]
+    return {
+        path: [f for f in files if f['path'].startswith(path + '/')] if path else files
+        for path in paths
+    }
+
+def download_file(url: str, cache: Optional[HttpCache] = None) -> Optional[bytes]:
+    """Download a file from URL.
+    
+    With a cache, a 304 Not Modified reply is raised to the caller as an HTTPError.
+    """
+    try:
+        return github_request(url, cache=cache)
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cache is not None:
+            raise
+        print(f"Error downloading {url}: {e}")
+        return None
     except Exception as e:
         print(f"Error downloading {url}: {e}")
         return None
@@ -252,23 +543,29 @@ def download_file(url: str) -> Optional[bytes]:
 # SURGE PARSING
 # ============================================================================
 
+# The parsers take an optional data_sha256 so a caller that has already
+# hashed the file bytes doesn't make them hash the whole buffer again
+
+def path_id(path: str) -> str:
+    """16 hex character id for an asset path."""
+    return hashlib.sha256(path.encode()).hexdigest()[:16]
+
 def parse_surge_wt_header(data: bytes) -> Optional[Dict]:
     """Parse Surge .wt wavetable header."""
     if len(data) < 12:
         return None
     
     # Surge WT magic: 'vaws' (0x77617673) in little-endian
-    magic = struct.unpack('<I', data[0:4])[0]
+    magic = _U32_LE.unpack_from(data, 0)[0]
     if magic != 0x77617673:
         return None
     
     # Header: magic(4) + frame_size(4) + frame_count(4) + flags(4)
-    frame_size = struct.unpack('<I', data[4:8])[0]
-    frame_count = struct.unpack('<I', data[8:12])[0]
-    
-    flags = 0
     if len(data) >= 16:
-        flags = struct.unpack('<I', data[12:16])[0]
+        frame_size, frame_count, flags = _WT_HEADER_FLAGS.unpack_from(data, 4)
+    else:
+        frame_size, frame_count = _WT_HEADER.unpack_from(data, 4)
+        flags = 0
     
     is_float = (flags & 0x04) != 0
     
@@ -280,7 +577,8 @@ def parse_surge_wt_header(data: bytes) -> Optional[Dict]:
     }
 
 def parse_surge_wavetable(data: bytes, name: str, path: str, category: str, 
-                          is_third_party: bool = False, contributor: Optional[str] = None) -> Optional[WavetableData]:
+                          is_third_party: bool = False, contributor: Optional[str] = None,
+                          data_sha256: Optional[str] = None) -> Optional[WavetableData]:
     """Parse a Surge .wt wavetable file."""
     header = parse_surge_wt_header(data)
     if not header:
@@ -298,21 +596,17 @@ def parse_surge_wavetable(data: bytes, name: str, path: str, category: str,
         expected_size = header_size + samples_per_table * 4
         if len(data) < expected_size:
             return None
-        samples = struct.unpack(f'<{samples_per_table}f', data[header_size:header_size + samples_per_table * 4])
+        samples = np.frombuffer(data, dtype='<f4', count=samples_per_table, offset=header_size)
     else:
         expected_size = header_size + samples_per_table * 2
         if len(data) < expected_size:
             return None
-        int_samples = struct.unpack(f'<{samples_per_table}h', data[header_size:header_size + samples_per_table * 2])
-        samples = [s / 32768.0 for s in int_samples]
-    
-    # Convert to float32 and base64 encode
-    import array
-    float_array = array.array('f', samples)
-    data_b64 = base64.b64encode(float_array.tobytes()).decode('ascii')
+        samples = np.frombuffer(data, dtype='<i2', count=samples_per_table,
+                                offset=header_size).astype(np.float32)
+        samples *= np.float32(1.0 / 32768.0)
     
     return WavetableData(
-        id=hashlib.sha256(path.encode()).hexdigest()[:16],
+        id=path_id(path),
         name=name,
         source='surge',
         category=category,
@@ -322,13 +616,39 @@ def parse_surge_wavetable(data: bytes, name: str, path: str, category: str,
         bit_depth=32 if is_float else 16,
         is_third_party=is_third_party,
         contributor=contributor,
-        data_b64=data_b64,
-        sha256=hashlib.sha256(data).hexdigest(),
+        data=samples.tobytes(),
+        sha256=data_sha256 or hashlib.sha256(data).hexdigest(),
         file_size=len(data)
     )
 
+if njit is not None:
+    @njit(cache=True, boundscheck=False)
+    def _decode_pcm24_kernel(buf, stride, out):
+        for i in range(out.shape[0]):
+            j = i * stride
+            v = np.int32(buf[j]) | (np.int32(buf[j + 1]) << 8) | (np.int32(buf[j + 2]) << 16)
+            # Sign-extend from bit 23
+            v = (v ^ 0x800000) - 0x800000
+            out[i] = v * np.float32(1.0 / 8388608.0)
+
+def decode_pcm24(buf: np.ndarray, stride: int) -> np.ndarray:
+    """Decode the first 24-bit little-endian sample of each frame to float32."""
+    if njit is not None:
+        samples = np.empty(len(buf) // stride, dtype=np.float32)
+        _decode_pcm24_kernel(buf, stride, samples)
+        return samples
+    
+    raw = buf.reshape(-1, stride)
+    # The int8 cast of the high byte sign-extends the 24-bit value
+    samples = (raw[:, 0].astype(np.int32)
+               | raw[:, 1].astype(np.int32) << 8
+               | raw[:, 2].astype(np.int8).astype(np.int32) << 16).astype(np.float32)
+    samples *= np.float32(1.0 / 8388608.0)
+    return samples
+
 def parse_surge_wav_wavetable(data: bytes, name: str, path: str, category: str,
-                               is_third_party: bool = False, contributor: Optional[str] = None) -> Optional[WavetableData]:
+                               is_third_party: bool = False, contributor: Optional[str] = None,
+                               data_sha256: Optional[str] = None) -> Optional[WavetableData]:
     """Parse a WAV file as wavetable (Serum-style or multi-cycle)."""
     if len(data) < 44:
         return None
@@ -337,19 +657,19 @@ def parse_surge_wav_wavetable(data: bytes, name: str, path: str, category: str,
     if data[0:4] != b'RIFF' or data[8:12] != b'WAVE':
         return None
     
-    # Parse WAV chunks
+    # Parse WAV chunks; slices of the memoryview are zero-copy
+    mv = memoryview(data)
     pos = 12
     fmt_data = None
     audio_data = None
     
     while pos < len(data) - 8:
-        chunk_id = data[pos:pos+4]
-        chunk_size = struct.unpack('<I', data[pos+4:pos+8])[0]
+        chunk_id, chunk_size = _CHUNK_HDR.unpack_from(mv, pos)
         
         if chunk_id == b'fmt ':
-            fmt_data = data[pos+8:pos+8+chunk_size]
+            fmt_data = mv[pos+8:pos+8+chunk_size]
         elif chunk_id == b'data':
-            audio_data = data[pos+8:pos+8+chunk_size]
+            audio_data = mv[pos+8:pos+8+chunk_size]
             break
             
         pos += 8 + chunk_size
@@ -360,34 +680,31 @@ def parse_surge_wav_wavetable(data: bytes, name: str, path: str, category: str,
         return None
     
     # Parse format
-    audio_format = struct.unpack('<H', fmt_data[0:2])[0]
-    num_channels = struct.unpack('<H', fmt_data[2:4])[0]
-    sample_rate = struct.unpack('<I', fmt_data[4:8])[0]
-    bits_per_sample = struct.unpack('<H', fmt_data[14:16])[0]
+    audio_format, num_channels, sample_rate, _, _, bits_per_sample = _FMT_HDR.unpack_from(fmt_data)
     
     if audio_format not in [1, 3]:  # PCM or IEEE float
         return None
     
     # Extract samples (mono only, take first channel)
     bytes_per_sample = bits_per_sample // 8
-    total_samples = len(audio_data) // (bytes_per_sample * num_channels)
-    
-    samples = []
-    for i in range(total_samples):
-        offset = i * bytes_per_sample * num_channels
-        if bits_per_sample == 16:
-            val = struct.unpack('<h', audio_data[offset:offset+2])[0]
-            samples.append(val / 32768.0)
-        elif bits_per_sample == 24:
-            val = struct.unpack('<i', audio_data[offset:offset+3] + (b'\x00' if audio_data[offset+2] < 128 else b'\xff'))[0]
-            samples.append(val / 8388608.0)
-        elif bits_per_sample == 32:
-            if audio_format == 3:  # Float
-                val = struct.unpack('<f', audio_data[offset:offset+4])[0]
-            else:
-                val = struct.unpack('<i', audio_data[offset:offset+4])[0]
-                val = val / 2147483648.0
-            samples.append(val)
+    frame_bytes = bytes_per_sample * num_channels
+    total_samples = len(audio_data) // frame_bytes
+    
+    # Decode whole frames in one vectorized pass; frames are interleaved, so
+    # striding by the channel count keeps channel 0
+    pcm = audio_data[:total_samples * frame_bytes]
+    if bits_per_sample == 16:
+        samples = np.frombuffer(pcm, dtype='<i2')[::num_channels].astype(np.float32)
+        samples *= np.float32(1.0 / 32768.0)
+    elif bits_per_sample == 24:
+        samples = decode_pcm24(np.frombuffer(pcm, dtype=np.uint8), frame_bytes)
+    elif bits_per_sample == 32 and audio_format == 3:  # Float
+        samples = np.frombuffer(pcm, dtype='<f4')[::num_channels]
+    elif bits_per_sample == 32:
+        samples = np.frombuffer(pcm, dtype='<i4')[::num_channels].astype(np.float32)
+        samples *= np.float32(1.0 / 2147483648.0)
+    else:
+        samples = np.empty(0, dtype=np.float32)
     
     # Detect frame size (Serum uses 2048)
     frame_size = 2048
@@ -402,12 +719,8 @@ def parse_surge_wav_wavetable(data: bytes, name: str, path: str, category: str,
     # Truncate to whole frames
     samples = samples[:frame_count * frame_size]
     
-    import array
-    float_array = array.array('f', samples)
-    data_b64 = base64.b64encode(float_array.tobytes()).decode('ascii')
-    
     return WavetableData(
-        id=hashlib.sha256(path.encode()).hexdigest()[:16],
+        id=path_id(path),
         name=name,
         source='surge',
         category=category,
@@ -418,8 +731,8 @@ def parse_surge_wav_wavetable(data: bytes, name: str, path: str, category: str,
         bit_depth=bits_per_sample,
         is_third_party=is_third_party,
         contributor=contributor,
-        data_b64=data_b64,
-        sha256=hashlib.sha256(data).hexdigest(),
+        data=samples.tobytes(),
+        sha256=data_sha256 or hashlib.sha256(data).hexdigest(),
         file_size=len(data)
     )
 
@@ -443,29 +756,134 @@ def parse_surge_fxp_preset(data: bytes, path: str) -> Optional[PresetData]:
     
     # For FPCh (chunk), extract XML
     if fx_magic == b'FPCh':
-        chunk_size = struct.unpack('>I', data[56:60])[0]
-        chunk_data = data[60:60+chunk_size]
+        chunk_size = _U32_BE.unpack_from(data, 56)[0]
+        chunk_start = 60
+        chunk_end = min(len(data), chunk_start + chunk_size)
         
-        # Find XML in chunk
-        xml_start = -1
-        for i in range(min(len(chunk_data), 1000)):
-            if chunk_data[i:i+5] == b'<?xml' or chunk_data[i:i+6] == b'<patch':
-                xml_start = i
-                break
+        # Find XML starting within the first 1000 bytes of the chunk
+        search_end = min(chunk_start + 1000, chunk_end)
+        starts = [pos for pos in (
+            data.find(b'<?xml', chunk_start, min(search_end + 4, chunk_end)),
+            data.find(b'<patch', chunk_start, min(search_end + 5, chunk_end)),
+        ) if pos >= 0]
         
-        if xml_start >= 0:
-            # Find end of XML
-            xml_end = len(chunk_data)
-            for i in range(len(chunk_data) - 1, xml_start, -1):
-                if chunk_data[i] == ord('>'):
-                    xml_end = i + 1
-                    break
+        if starts:
+            xml_start = min(starts)
+            # Find end of XML: the last '>' after the start, else the chunk end
+            xml_end = data.rfind(b'>', xml_start + 1, chunk_end) + 1 or chunk_end
             
-            xml_str = chunk_data[xml_start:xml_end].decode('utf-8', errors='replace')
+            xml_str = data[xml_start:xml_end].decode('utf-8', errors='replace')
             return parse_surge_preset_xml(xml_str, path, preset_name)
     
     return None
 
+@lru_cache(maxsize=2048)
+def parse_surge_patch_xml(xml_str: str) -> Tuple:
+    """Parse the path-independent parts of Surge preset XML.
+    
+    Preset packs ship many identical patches, so results are cached by the
+    XML text. Returns (name, category, author, comment, oscillators, filters,
+    envelopes, lfos, modulations, effects) with the sections as JSON strings;
+    name is None when the patch has no name attribute.
+    """
+    root = parse_xml(xml_str)
+    
+    # Get patch-level attributes
+    name = root.get('name')
+    category = root.get('category', 'Uncategorized')
+    author = root.get('author')
+    comment = root.get('comment')
+    
+    oscillators = []
+    filters = []
+    envelopes = []
+    lfos = []
+    modulations = []
+    effects = []
+    
+    # Parse scenes
+    for scene in root.findall('.//scene'):
+        scene_id = scene.get('id', '0')
+        
+        # Parse oscillators
+        for i, osc in enumerate(scene.findall('.//osc')):
+            osc_type = int(osc.get('type', 0))
+            osc_data = OscillatorData(
+                index=i,
+                osc_type=osc_type,
+                osc_type_name=get_surge_osc_type_name(osc_type),
+                wavetable_name=osc.get('wavetable'),
+                wavetable_position=float(osc.get('morph', 0)),
+                level=float(osc.get('level', 1)),
+                pan=float(osc.get('pan', 0)),
+                tune_semitones=float(osc.get('pitch', 0)),
+                tune_cents=float(osc.get('detune', 0)),
+                unison_voices=int(osc.get('unison_voices', 1)),
+                unison_detune=float(osc.get('unison_detune', 0)),
+            )
+            oscillators.append(record_to_dict(osc_data))
+        
+        # Parse filters
+        for i, filt in enumerate(scene.findall('.//filter')):
+            filt_type = int(filt.get('type', 0))
+            filt_data = FilterData(
+                index=i,
+                filter_type=filt_type,
+                filter_type_name=get_surge_filter_type_name(filt_type),
+                cutoff=float(filt.get('cutoff', 1000)),
+                resonance=float(filt.get('resonance', 0)),
+                drive=float(filt.get('drive', 0)),
+                keytrack=float(filt.get('keytrack', 0)),
+            )
+            filters.append(record_to_dict(filt_data))
+        
+        # Parse envelopes
+        for env in scene.findall('.//envelope'):
+            env_name = env.get('id', 'amp')
+            env_data = EnvelopeData(
+                name=env_name,
+                attack=float(env.get('attack', 0.01)),
+                decay=float(env.get('decay', 0.1)),
+                sustain=float(env.get('sustain', 0.7)),
+                release=float(env.get('release', 0.3)),
+            )
+            envelopes.append(record_to_dict(env_data))
+        
+        # Parse LFOs
+        for i, lfo in enumerate(scene.findall('.//lfo')):
+            shape = int(lfo.get('shape', 0))
+            lfo_data = LFOData(
+                index=i,
+                waveform=shape,
+                waveform_name=get_surge_lfo_shape_name(shape),
+                rate=float(lfo.get('rate', 1)),
+                sync=lfo.get('temposync', '0') == '1',
+                depth=float(lfo.get('magnitude', 1)),
+            )
+            lfos.append(record_to_dict(lfo_data))
+    
+    # Parse modulation matrix
+    for mod in root.findall('.//modrouting'):
+        mod_data = ModulationData(
+            source=mod.get('source', ''),
+            destination=mod.get('destination', ''),
+            amount=float(mod.get('depth', 0)),
+        )
+        modulations.append(record_to_dict(mod_data))
+    
+    # Parse effects
+    for fx in root.findall('.//fx'):
+        fx_type = fx.get('type', 'off')
+        fx_data = EffectData(
+            effect_type=fx_type,
+            enabled=fx.get('enabled', '1') == '1',
+            mix=float(fx.get('mix', 1)),
+        )
+        effects.append(record_to_dict(fx_data))
+    
+    return (name, category, author, comment, dumps_json(oscillators), dumps_json(filters),
+            dumps_json(envelopes), dumps_json(lfos), dumps_json(modulations), dumps_json(effects))
+
 def parse_surge_preset_xml(xml_str: str, path: str, preset_name: str) -> Optional[PresetData]:
     """Parse Surge preset XML content."""
     try:
@@ -474,115 +892,25 @@ def parse_surge_preset_xml(xml_str: str, path: str, preset_name: str) -> Optiona
         if not xml_str.startswith('<?xml') and not xml_str.startswith('<patch'):
             return None
         
-        root = ET.fromstring(xml_str)
-        
-        # Get patch-level attributes
-        name = root.get('name', preset_name)
-        category = root.get('category', 'Uncategorized')
-        author = root.get('author')
-        comment = root.get('comment')
-        
-        oscillators = []
-        filters = []
-        envelopes = []
-        lfos = []
-        modulations = []
-        effects = []
-        
-        # Parse scenes
-        for scene in root.findall('.//scene'):
-            scene_id = scene.get('id', '0')
-            
-            # Parse oscillators
-            for i, osc in enumerate(scene.findall('.//osc')):
-                osc_type = int(osc.get('type', 0))
-                osc_data = OscillatorData(
-                    index=i,
-                    osc_type=osc_type,
-                    osc_type_name=get_surge_osc_type_name(osc_type),
-                    wavetable_name=osc.get('wavetable'),
-                    wavetable_position=float(osc.get('morph', 0)),
-                    level=float(osc.get('level', 1)),
-                    pan=float(osc.get('pan', 0)),
-                    tune_semitones=float(osc.get('pitch', 0)),
-                    tune_cents=float(osc.get('detune', 0)),
-                    unison_voices=int(osc.get('unison_voices', 1)),
-                    unison_detune=float(osc.get('unison_detune', 0)),
-                )
-                oscillators.append(asdict(osc_data))
-            
-            # Parse filters
-            for i, filt in enumerate(scene.findall('.//filter')):
-                filt_type = int(filt.get('type', 0))
-                filt_data = FilterData(
-                    index=i,
-                    filter_type=filt_type,
-                    filter_type_name=get_surge_filter_type_name(filt_type),
-                    cutoff=float(filt.get('cutoff', 1000)),
-                    resonance=float(filt.get('resonance', 0)),
-                    drive=float(filt.get('drive', 0)),
-                    keytrack=float(filt.get('keytrack', 0)),
-                )
-                filters.append(asdict(filt_data))
-            
-            # Parse envelopes
-            for env in scene.findall('.//envelope'):
-                env_name = env.get('id', 'amp')
-                env_data = EnvelopeData(
-                    name=env_name,
-                    attack=float(env.get('attack', 0.01)),
-                    decay=float(env.get('decay', 0.1)),
-                    sustain=float(env.get('sustain', 0.7)),
-                    release=float(env.get('release', 0.3)),
-                )
-                envelopes.append(asdict(env_data))
-            
-            # Parse LFOs
-            for i, lfo in enumerate(scene.findall('.//lfo')):
-                shape = int(lfo.get('shape', 0))
-                lfo_data = LFOData(
-                    index=i,
-                    waveform=shape,
-                    waveform_name=get_surge_lfo_shape_name(shape),
-                    rate=float(lfo.get('rate', 1)),
-                    sync=lfo.get('temposync', '0') == '1',
-                    depth=float(lfo.get('magnitude', 1)),
-                )
-                lfos.append(asdict(lfo_data))
-        
-        # Parse modulation matrix
-        for mod in root.findall('.//modrouting'):
-            mod_data = ModulationData(
-                source=mod.get('source', ''),
-                destination=mod.get('destination', ''),
-                amount=float(mod.get('depth', 0)),
-            )
-            modulations.append(asdict(mod_data))
-        
-        # Parse effects
-        for fx in root.findall('.//fx'):
-            fx_type = fx.get('type', 'off')
-            fx_data = EffectData(
-                effect_type=fx_type,
-                enabled=fx.get('enabled', '1') == '1',
-                mix=float(fx.get('mix', 1)),
-            )
-            effects.append(asdict(fx_data))
+        (name, category, author, comment, oscillators, filters,
+         envelopes, lfos, modulations, effects) = parse_surge_patch_xml(xml_str)
+        if name is None:
+            name = preset_name
         
         return PresetData(
-            id=hashlib.sha256(path.encode()).hexdigest()[:16],
+            id=path_id(path),
             name=name,
             source='surge',
             category=category,
             path=path,
             author=author,
             description=comment,
-            oscillators=json.dumps(oscillators),
-            filters=json.dumps(filters),
-            envelopes=json.dumps(envelopes),
-            lfos=json.dumps(lfos),
-            modulations=json.dumps(modulations),
-            effects=json.dumps(effects),
+            oscillators=oscillators,
+            filters=filters,
+            envelopes=envelopes,
+            lfos=lfos,
+            modulations=modulations,
+            effects=effects,
             raw_data=xml_str[:10000],  # Store first 10KB of raw XML
             sha256=hashlib.sha256(xml_str.encode()).hexdigest(),
             file_size=len(xml_str)
@@ -592,54 +920,121 @@ def parse_surge_preset_xml(xml_str: str, path: str, preset_name: str) -> Optiona
         print(f"XML parse error for {path}: {e}")
         return None
 
+SURGE_OSC_TYPE_NAMES = (
+    'Classic', 'Sine', 'Wavetable', 'SH Noise',
+    'Audio Input', 'FM3', 'FM2', 'Window',
+    'Modern', 'String', 'Twist', 'Alias',
+    'Phase Mod',
+)
+
+SURGE_FILTER_TYPE_NAMES = (
+    'Off', 'LP 12dB', 'LP 24dB', 'LP Legacy',
+    'HP 12dB', 'HP 24dB', 'BP 12dB', 'BP 24dB',
+    'Notch 12dB', 'Notch 24dB', 'Comb+', 'Comb-',
+    'Sample&Hold', 'Vintage Ladder', 'OB-Xd 12dB', 'OB-Xd 24dB',
+    'K35 LP', 'K35 HP', 'Diode Ladder', 'Cutoff Warp LP',
+    'Cutoff Warp HP', 'Cutoff Warp BP', 'Cutoff Warp N', 'Resonance Warp LP',
+    'Resonance Warp HP', 'Resonance Warp BP', 'Resonance Warp N', 'Tri-Pole',
+)
+
+SURGE_LFO_SHAPE_NAMES = (
+    'Sine', 'Triangle', 'Square', 'Ramp',
+    'Noise', 'S&H', 'Envelope', 'Stepseq',
+    'MSEG', 'Function',
+)
+
 def get_surge_osc_type_name(osc_type: int) -> str:
     """Get Surge oscillator type name."""
-    names = {
-        0: 'Classic', 1: 'Sine', 2: 'Wavetable', 3: 'SH Noise',
-        4: 'Audio Input', 5: 'FM3', 6: 'FM2', 7: 'Window',
-        8: 'Modern', 9: 'String', 10: 'Twist', 11: 'Alias',
-        12: 'Phase Mod'
-    }
-    return names.get(osc_type, f'Unknown ({osc_type})')
+    if 0 <= osc_type < len(SURGE_OSC_TYPE_NAMES):
+        return SURGE_OSC_TYPE_NAMES[osc_type]
+    return f'Unknown ({osc_type})'
 
 def get_surge_filter_type_name(filt_type: int) -> str:
     """Get Surge filter type name."""
-    names = {
-        0: 'Off', 1: 'LP 12dB', 2: 'LP 24dB', 3: 'LP Legacy',
-        4: 'HP 12dB', 5: 'HP 24dB', 6: 'BP 12dB', 7: 'BP 24dB',
-        8: 'Notch 12dB', 9: 'Notch 24dB', 10: 'Comb+', 11: 'Comb-',
-        12: 'Sample&Hold', 13: 'Vintage Ladder', 14: 'OB-Xd 12dB',
-        15: 'OB-Xd 24dB', 16: 'K35 LP', 17: 'K35 HP', 18: 'Diode Ladder',
-        19: 'Cutoff Warp LP', 20: 'Cutoff Warp HP', 21: 'Cutoff Warp BP',
-        22: 'Cutoff Warp N', 23: 'Resonance Warp LP', 24: 'Resonance Warp HP',
-        25: 'Resonance Warp BP', 26: 'Resonance Warp N', 27: 'Tri-Pole'
-    }
-    return names.get(filt_type, f'Unknown ({filt_type})')
+    if 0 <= filt_type < len(SURGE_FILTER_TYPE_NAMES):
+        return SURGE_FILTER_TYPE_NAMES[filt_type]
+    return f'Unknown ({filt_type})'
 
 def get_surge_lfo_shape_name(shape: int) -> str:
     """Get Surge LFO shape name."""
-    names = {
-        0: 'Sine', 1: 'Triangle', 2: 'Square', 3: 'Ramp',
-        4: 'Noise', 5: 'S&H', 6: 'Envelope', 7: 'Stepseq',
-        8: 'MSEG', 9: 'Function'
-    }
-    return names.get(shape, f'Unknown ({shape})')
+    if 0 <= shape < len(SURGE_LFO_SHAPE_NAMES):
+        return SURGE_LFO_SHAPE_NAMES[shape]
+    return f'Unknown ({shape})'
 
 # ============================================================================
 # VITAL PARSING
 # ============================================================================
 
-def parse_vital_preset(data: bytes, path: str) -> Optional[PresetData]:
+def gunzip_or_raw(data: bytes) -> bytes:
+    """Decompress gzip data, or return data unchanged if it isn't gzip."""
+    # A single decompressobj pass inflates straight from the input buffer;
+    # zlib checks the gzip header, CRC and length itself
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    try:
+        inflated = decompressor.decompress(data)
+        if decompressor.eof and not decompressor.unused_data:
+            return inflated
+    except zlib.error:
+        pass
+    
+    # Non-gzip data and truncated, multi-member or padded streams get gzip's
+    # full handling, which is also lenient about reserved header flags
+    try:
+        return gzip.decompress(data)
+    except Exception:
+        return data
+
+# PresetData fields parse_vital_preset copies from the JSON without conversion
+VITAL_JSON_COLUMNS = ('name', 'category', 'author', 'description',
+                      'master_volume', 'polyphony', 'portamento')
+
+def is_sqlite_value(value) -> bool:
+    """Whether sqlite3 can bind value as a column value."""
+    if value is None or isinstance(value, (str, float, bytes)):
+        return True
+    return isinstance(value, int) and -2**63 <= value < 2**63
+
+def vital_module_keys(module: str, count: int, params: Tuple[str, ...]) -> Tuple[Dict[str, str], ...]:
+    """Settings keys for each numbered instance of a Vital module, by parameter."""
+    return tuple(
+        {param: f'{module}_{i}_{param}' for param in params}
+        for i in range(1, count + 1)
+    )
+
+# Preset settings keys, built once rather than formatted for every preset
+VITAL_OSC_KEYS = vital_module_keys('osc', 3, (
+    'on', 'wave_frame', 'level', 'pan', 'transpose', 'tune', 'unison_voices',
+    'unison_detune', 'unison_blend', 'phase', 'random_phase', 'distortion_amount'))
+VITAL_FILTER_KEYS = vital_module_keys('filter', 2, (
+    'on', 'model', 'cutoff', 'resonance', 'drive', 'mix', 'keytrack'))
+VITAL_ENV_KEYS = vital_module_keys('env', 6, (
+    'attack', 'decay', 'sustain', 'release', 'attack_power', 'decay_power', 'release_power'))
+VITAL_LFO_KEYS = vital_module_keys('lfo', 8, (
+    'frequency', 'shape', 'sync', 'sync_type', 'phase', 'delay', 'fade'))
+
+VITAL_EFFECT_TYPES = ('chorus', 'compressor', 'delay', 'distortion', 'eq',
+                      'filter_fx', 'flanger', 'phaser', 'reverb')
+VITAL_EFFECT_KEYS = tuple((fx_type, f'{fx_type}_on', f'{fx_type}_mix') for fx_type in VITAL_EFFECT_TYPES)
+
+# Effect parameter prefix by the key's first word; no two effect types share one
+VITAL_EFFECT_PREFIXES = {fx_type.partition('_')[0]: (f'{fx_type}_', fx_type) for fx_type in VITAL_EFFECT_TYPES}
+
+def group_vital_effect_params(settings: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Split preset settings into each effect's parameters in one pass."""
+    groups = {fx_type: {} for fx_type in VITAL_EFFECT_TYPES}
+    for key, value in settings.items():
+        match = VITAL_EFFECT_PREFIXES.get(key.partition('_')[0])
+        if match and key.startswith(match[0]):
+            groups[match[1]][key] = value
+    return groups
+
+def parse_vital_preset(data: bytes, path: str, data_sha256: Optional[str] = None) -> Optional[PresetData]:
     """Parse a Vital .vital preset file (gzipped JSON)."""
     try:
         # Vital presets are gzipped JSON
-        try:
-            json_data = gzip.decompress(data)
-        except:
-            # Maybe not gzipped
-            json_data = data
+        json_data = gunzip_or_raw(data)
         
-        preset = json.loads(json_data)
+        preset = loads_json(json_data)
         
         # Extract preset info
         preset_name = preset.get('preset_name', Path(path).stem)
@@ -660,10 +1055,9 @@ def parse_vital_preset(data: bytes, path: str) -> Optional[PresetData]:
         settings = preset.get('settings', preset)
         
         # Parse oscillators (osc_1, osc_2, osc_3)
-        for i in range(1, 4):
-            prefix = f'osc_{i}_'
-            if f'{prefix}on' in settings:
-                osc_on = settings.get(f'{prefix}on', 1)
+        for i, keys in enumerate(VITAL_OSC_KEYS, 1):
+            if keys['on'] in settings:
+                osc_on = settings.get(keys['on'], 1)
                 if osc_on:
                     # Get wavetable info
                     wt_name = None
@@ -678,71 +1072,68 @@ def parse_vital_preset(data: bytes, path: str) -> Optional[PresetData]:
                         osc_type=2,  # Vital is always wavetable
                         osc_type_name='Wavetable',
                         wavetable_name=wt_name,
-                        wavetable_position=settings.get(f'{prefix}wave_frame', 0),
-                        level=settings.get(f'{prefix}level', 1),
-                        pan=settings.get(f'{prefix}pan', 0),
-                        tune_semitones=settings.get(f'{prefix}transpose', 0),
-                        tune_cents=settings.get(f'{prefix}tune', 0),
-                        unison_voices=int(settings.get(f'{prefix}unison_voices', 1)),
-                        unison_detune=settings.get(f'{prefix}unison_detune', 0),
-                        unison_blend=settings.get(f'{prefix}unison_blend', 0),
-                        phase=settings.get(f'{prefix}phase', 0),
-                        phase_randomize=settings.get(f'{prefix}random_phase', 0),
-                        distortion=settings.get(f'{prefix}distortion_amount', 0),
+                        wavetable_position=settings.get(keys['wave_frame'], 0),
+                        level=settings.get(keys['level'], 1),
+                        pan=settings.get(keys['pan'], 0),
+                        tune_semitones=settings.get(keys['transpose'], 0),
+                        tune_cents=settings.get(keys['tune'], 0),
+                        unison_voices=int(settings.get(keys['unison_voices'], 1)),
+                        unison_detune=settings.get(keys['unison_detune'], 0),
+                        unison_blend=settings.get(keys['unison_blend'], 0),
+                        phase=settings.get(keys['phase'], 0),
+                        phase_randomize=settings.get(keys['random_phase'], 0),
+                        distortion=settings.get(keys['distortion_amount'], 0),
                     )
-                    oscillators.append(asdict(osc_data))
+                    oscillators.append(record_to_dict(osc_data))
         
         # Parse filters (filter_1, filter_2)
-        for i in range(1, 3):
-            prefix = f'filter_{i}_'
-            if f'{prefix}on' in settings:
-                filt_on = settings.get(f'{prefix}on', 0)
-                filt_model = int(settings.get(f'{prefix}model', 0))
+        for i, keys in enumerate(VITAL_FILTER_KEYS, 1):
+            if keys['on'] in settings:
+                filt_on = settings.get(keys['on'], 0)
+                filt_model = int(settings.get(keys['model'], 0))
                 filt_data = FilterData(
                     index=i-1,
                     filter_type=filt_model,
                     filter_type_name=get_vital_filter_type_name(filt_model),
-                    cutoff=settings.get(f'{prefix}cutoff', 60),  # In semitones
-                    resonance=settings.get(f'{prefix}resonance', 0),
-                    drive=settings.get(f'{prefix}drive', 0),
-                    mix=settings.get(f'{prefix}mix', 1),
-                    keytrack=settings.get(f'{prefix}keytrack', 0),
+                    cutoff=settings.get(keys['cutoff'], 60),  # In semitones
+                    resonance=settings.get(keys['resonance'], 0),
+                    drive=settings.get(keys['drive'], 0),
+                    mix=settings.get(keys['mix'], 1),
+                    keytrack=settings.get(keys['keytrack'], 0),
                 )
-                filters.append(asdict(filt_data))
+                filters.append(record_to_dict(filt_data))
         
         # Parse envelopes
         env_names = ['env_1', 'env_2', 'env_3', 'env_4', 'env_5', 'env_6']
-        for env_name in env_names:
-            prefix = f'{env_name}_'
-            if f'{prefix}attack' in settings:
+        for env_name, keys in zip(env_names, VITAL_ENV_KEYS):
+            if keys['attack'] in settings:
                 env_data = EnvelopeData(
                     name=env_name,
-                    attack=settings.get(f'{prefix}attack', 0),
-                    decay=settings.get(f'{prefix}decay', 0),
-                    sustain=settings.get(f'{prefix}sustain', 1),
-                    release=settings.get(f'{prefix}release', 0),
-                    attack_curve=settings.get(f'{prefix}attack_power', 0),
-                    decay_curve=settings.get(f'{prefix}decay_power', 0),
-                    release_curve=settings.get(f'{prefix}release_power', 0),
+                    attack=settings.get(keys['attack'], 0),
+                    decay=settings.get(keys['decay'], 0),
+                    sustain=settings.get(keys['sustain'], 1),
+                    release=settings.get(keys['release'], 0),
+                    attack_curve=settings.get(keys['attack_power'], 0),
+                    decay_curve=settings.get(keys['decay_power'], 0),
+                    release_curve=settings.get(keys['release_power'], 0),
                 )
-                envelopes.append(asdict(env_data))
+                envelopes.append(record_to_dict(env_data))
         
         # Parse LFOs
-        for i in range(1, 9):
-            prefix = f'lfo_{i}_'
-            if f'{prefix}frequency' in settings:
+        for i, keys in enumerate(VITAL_LFO_KEYS, 1):
+            if keys['frequency'] in settings:
                 lfo_data = LFOData(
                     index=i-1,
-                    waveform=int(settings.get(f'{prefix}shape', 0)),
-                    waveform_name=get_vital_lfo_shape_name(int(settings.get(f'{prefix}shape', 0))),
-                    rate=settings.get(f'{prefix}frequency', 1),
-                    sync=settings.get(f'{prefix}sync', 0) > 0,
-                    sync_rate=settings.get(f'{prefix}sync_type', '1/4'),
-                    phase=settings.get(f'{prefix}phase', 0),
-                    delay=settings.get(f'{prefix}delay', 0),
-                    fade_in=settings.get(f'{prefix}fade', 0),
+                    waveform=int(settings.get(keys['shape'], 0)),
+                    waveform_name=get_vital_lfo_shape_name(int(settings.get(keys['shape'], 0))),
+                    rate=settings.get(keys['frequency'], 1),
+                    sync=settings.get(keys['sync'], 0) > 0,
+                    sync_rate=settings.get(keys['sync_type'], '1/4'),
+                    phase=settings.get(keys['phase'], 0),
+                    delay=settings.get(keys['delay'], 0),
+                    fade_in=settings.get(keys['fade'], 0),
                 )
-                lfos.append(asdict(lfo_data))
+                lfos.append(record_to_dict(lfo_data))
         
         # Parse modulations
         mod_matrix = preset.get('modulations', [])
@@ -753,62 +1144,68 @@ def parse_vital_preset(data: bytes, path: str) -> Optional[PresetData]:
                 amount=mod.get('amount', 0),
                 bipolar=mod.get('bipolar', 1) == 1,
             )
-            modulations.append(asdict(mod_data))
+            modulations.append(record_to_dict(mod_data))
         
         # Parse effects
-        effect_types = ['chorus', 'compressor', 'delay', 'distortion', 'eq', 
-                       'filter_fx', 'flanger', 'phaser', 'reverb']
-        for fx_type in effect_types:
-            prefix = f'{fx_type}_'
-            if f'{prefix}on' in settings:
-                fx_on = settings.get(f'{prefix}on', 0)
-                fx_mix = settings.get(f'{prefix}mix', 1) if fx_type != 'eq' else 1
-                fx_params = {k: v for k, v in settings.items() if k.startswith(prefix)}
+        fx_groups = None
+        for fx_type, on_key, mix_key in VITAL_EFFECT_KEYS:
+            if on_key in settings:
+                fx_on = settings.get(on_key, 0)
+                fx_mix = settings.get(mix_key, 1) if fx_type != 'eq' else 1
+                if fx_groups is None:
+                    fx_groups = group_vital_effect_params(settings)
+                fx_params = fx_groups[fx_type]
                 
                 fx_data = EffectData(
                     effect_type=fx_type,
                     enabled=fx_on > 0,
                     mix=fx_mix,
-                    params=json.dumps(fx_params)
+                    params=dumps_json(fx_params)
                 )
-                effects.append(asdict(fx_data))
+                effects.append(record_to_dict(fx_data))
         
-        return PresetData(
-            id=hashlib.sha256(path.encode()).hexdigest()[:16],
+        preset_data = PresetData(
+            id=path_id(path),
             name=preset_name,
             source='vital',
             category=category,
             path=path,
             author=author if author else None,
             description=comments if comments else None,
-            oscillators=json.dumps(oscillators),
-            filters=json.dumps(filters),
-            envelopes=json.dumps(envelopes),
-            lfos=json.dumps(lfos),
-            modulations=json.dumps(modulations),
-            effects=json.dumps(effects),
+            oscillators=dumps_json(oscillators),
+            filters=dumps_json(filters),
+            envelopes=dumps_json(envelopes),
+            lfos=dumps_json(lfos),
+            modulations=dumps_json(modulations),
+            effects=dumps_json(effects),
             master_volume=settings.get('volume', 1),
             polyphony=int(settings.get('polyphony', 32)),
             portamento=settings.get('portamento_time', 0),
             raw_data=json_data[:10000].decode('utf-8', errors='replace'),
-            sha256=hashlib.sha256(data).hexdigest(),
+            sha256=data_sha256 or hashlib.sha256(data).hexdigest(),
             file_size=len(data)
         )
         
+        # Presets are inserted in batches, so a value copied from the JSON that
+        # sqlite3 can't bind has to be rejected here rather than at insert time
+        for column in VITAL_JSON_COLUMNS:
+            if not is_sqlite_value(getattr(preset_data, column)):
+                raise ValueError(f"unsupported {column} value")
+        
+        return preset_data
+        
     except Exception as e:
         print(f"Error parsing Vital preset {path}: {e}")
         return None
 
-def parse_vital_wavetable(data: bytes, name: str, path: str, category: str) -> Optional[WavetableData]:
+def parse_vital_wavetable(data: bytes, name: str, path: str, category: str,
+                          data_sha256: Optional[str] = None) -> Optional[WavetableData]:
     """Parse a Vital wavetable from preset or standalone file."""
     try:
         # Try to decompress if gzipped
-        try:
-            json_data = gzip.decompress(data)
-        except:
-            json_data = data
+        json_data = gunzip_or_raw(data)
         
-        wt_data = json.loads(json_data)
+        wt_data = loads_json(json_data)
         
         # Vital wavetables have 'groups' with 'components'
         groups = wt_data.get('groups', [])
@@ -833,28 +1230,21 @@ def parse_vital_wavetable(data: bytes, name: str, path: str, category: str) -> O
         frame_size = 2048
         frame_count = len(frames)
         
-        # Combine all frames
-        all_samples = []
-        for frame in frames:
-            # Vital stores as float32
-            num_samples = len(frame) // 4
-            samples = struct.unpack(f'<{num_samples}f', frame)
-            all_samples.extend(samples)
-        
-        import array
-        float_array = array.array('f', all_samples)
-        data_b64 = base64.b64encode(float_array.tobytes()).decode('ascii')
+        # Combine all frames; Vital stores them as little-endian float32, which
+        # is already the stored sample format
+        if any(len(frame) % 4 for frame in frames):
+            raise ValueError('wave_data is not a whole number of float32 samples')
         
         return WavetableData(
-            id=hashlib.sha256(path.encode()).hexdigest()[:16],
+            id=path_id(path),
             name=name,
             source='vital',
             category=category,
             path=path,
             frame_count=frame_count,
             frame_size=frame_size,
-            data_b64=data_b64,
-            sha256=hashlib.sha256(data).hexdigest(),
+            data=b''.join(frames),
+            sha256=data_sha256 or hashlib.sha256(data).hexdigest(),
             file_size=len(data)
         )
         
@@ -862,22 +1252,28 @@ def parse_vital_wavetable(data: bytes, name: str, path: str, category: str) -> O
         print(f"Error parsing Vital wavetable {path}: {e}")
         return None
 
+VITAL_FILTER_TYPE_NAMES = (
+    'Analog', 'Dirty', 'Ladder', 'Digital',
+    'Diode', 'Formant', 'Comb', 'Phaser',
+)
+
+# Vital allows custom shapes, but has presets
+VITAL_LFO_SHAPE_NAMES = (
+    'Sine', 'Triangle', 'Saw Up', 'Saw Down',
+    'Square', 'Random',
+)
+
 def get_vital_filter_type_name(model: int) -> str:
     """Get Vital filter model name."""
-    names = {
-        0: 'Analog', 1: 'Dirty', 2: 'Ladder', 3: 'Digital',
-        4: 'Diode', 5: 'Formant', 6: 'Comb', 7: 'Phaser'
-    }
-    return names.get(model, f'Unknown ({model})')
+    if 0 <= model < len(VITAL_FILTER_TYPE_NAMES):
+        return VITAL_FILTER_TYPE_NAMES[model]
+    return f'Unknown ({model})'
 
 def get_vital_lfo_shape_name(shape: int) -> str:
     """Get Vital LFO shape name."""
-    # Vital allows custom shapes, but has presets
-    names = {
-        0: 'Sine', 1: 'Triangle', 2: 'Saw Up', 3: 'Saw Down',
-        4: 'Square', 5: 'Random'
-    }
-    return names.get(shape, 'Custom')
+    if 0 <= shape < len(VITAL_LFO_SHAPE_NAMES):
+        return VITAL_LFO_SHAPE_NAMES[shape]
+    return 'Custom'
 
 # ============================================================================
 # DATABASE
@@ -886,6 +1282,10 @@ def get_vital_lfo_shape_name(shape: int) -> str:
 def create_database(db_path: str):
     """Create SQLite database with schema."""
     conn = sqlite3.connect(db_path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-65536')
     cursor = conn.cursor()
     
     # Wavetables table
@@ -902,13 +1302,35 @@ def create_database(db_path: str):
             bit_depth INTEGER DEFAULT 32,
             is_third_party INTEGER DEFAULT 0,
             contributor TEXT,
-            data_b64 TEXT,
+            data BLOB,
             sha256 TEXT,
             file_size INTEGER,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
     ''')
     
+    # Databases built before samples were stored as a BLOB need the column added
+    wt_columns = {row[1] for row in cursor.execute('PRAGMA table_info(wavetables)')}
+    if 'data' not in wt_columns:
+        cursor.execute('ALTER TABLE wavetables ADD COLUMN data BLOB')
+    
+    # Sample payloads, stored once per distinct file and joined on wavetables.sha256
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS wavetable_blobs (
+            sha256 TEXT PRIMARY KEY,
+            data BLOB
+        )
+    ''')
+    
+    # Databases from before the BLOB column keep base64 float32 samples in
+    # data_b64; move them into wavetable_blobs and drop the text copy
+    if 'data_b64' in wt_columns:
+        rows = cursor.execute(
+            'SELECT sha256, data_b64 FROM wavetables WHERE data_b64 IS NOT NULL AND sha256 IS NOT NULL'
+        ).fetchall()
+        cursor.executemany(INSERT_WAVETABLE_BLOB_SQL, [(sha256, base64.b64decode(b64)) for sha256, b64 in rows])
+        cursor.execute('UPDATE wavetables SET data_b64 = NULL WHERE data_b64 IS NOT NULL AND sha256 IS NOT NULL')
+    
     # Presets table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS presets (
@@ -947,6 +1369,48 @@ def create_database(db_path: str):
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_author ON presets(author)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_name ON presets(name)')
     
+    # Cover the source/category listings, which order by name
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_wavetables_source_category_name ON wavetables(source, category, name)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_presets_source_category_name ON presets(source, category, name)')
+    
+    # Search tables, rebuilt from presets by refresh_preset_search. Rows are
+    # keyed by position in the oscillators array, since Surge restarts the
+    # oscillator index in each scene; an older keying is simply rebuilt
+    pw_columns = {row[1] for row in cursor.execute('PRAGMA table_info(preset_wavetables)')}
+    if pw_columns and 'position' not in pw_columns:
+        cursor.execute('DROP TABLE preset_wavetables')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS preset_wavetables (
+            preset_id TEXT,
+            position INTEGER,
+            wavetable_name TEXT,
+            oscillator_index INTEGER,
+            PRIMARY KEY (preset_id, position)
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_preset_wavetables_name ON preset_wavetables(wavetable_name)')
+    # Trigram tokens let LIKE '%query%' substring searches use the index.
+    # They need FTS5 and SQLite 3.34+; without them searches scan presets
+    try:
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS presets_fts USING fts5(
+                name, category, author,
+                content='presets', content_rowid='rowid', tokenize='trigram'
+            )
+        ''')
+    except sqlite3.OperationalError as e:
+        print(f"Preset full-text index unavailable ({e}); searches will use LIKE")
+    
+    # Conditional request validators, so re-runs skip unchanged files
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB
+        )
+    ''')
+    
     # Metadata table
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS metadata (
@@ -958,231 +1422,419 @@ def create_database(db_path: str):
     conn.commit()
     return conn
 
-def insert_wavetable(conn: sqlite3.Connection, wt: WavetableData):
-    """Insert a wavetable into the database."""
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT OR REPLACE INTO wavetables 
-        (id, name, source, category, path, frame_count, frame_size, sample_rate, 
-         bit_depth, is_third_party, contributor, data_b64, sha256, file_size)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+WAVETABLE_COLUMNS = (
+    'id', 'name', 'source', 'category', 'path', 'frame_count', 'frame_size', 'sample_rate',
+    'bit_depth', 'is_third_party', 'contributor', 'data', 'sha256', 'file_size',
+)
+
+PRESET_COLUMNS = (
+    'id', 'name', 'source', 'category', 'path', 'author', 'description', 'tags', 'oscillators',
+    'filters', 'envelopes', 'lfos', 'modulations', 'effects', 'master_volume', 'master_tune',
+    'polyphony', 'portamento', 'raw_data', 'sha256', 'file_size',
+)
+
+def upsert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """INSERT that updates an existing row in place, keeping its created_at."""
+    updates = ', '.join(f'{column} = excluded.{column}' for column in columns[1:])
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({columns[0]}) DO UPDATE SET {updates}"
+    )
+
+INSERT_WAVETABLE_SQL = upsert_sql('wavetables', WAVETABLE_COLUMNS)
+# Re-parsed samples replace the stored payload, so a parser fix or a
+# --refresh run rewrites blobs instead of keeping the first version
+INSERT_WAVETABLE_BLOB_SQL = (
+    'INSERT INTO wavetable_blobs (sha256, data) VALUES (?, ?) '
+    'ON CONFLICT(sha256) DO UPDATE SET data = excluded.data'
+)
+INSERT_PRESET_SQL = upsert_sql('presets', PRESET_COLUMNS)
+
+# Parsed records buffered by the download loops before each bulk insert
+INSERT_BATCH_SIZE = 500
+
+def wavetable_row(wt: WavetableData) -> Tuple:
+    # Samples go to wavetable_blobs; the inline data column is cleared so
+    # rows written by older versions stop carrying a second copy
+    return (
         wt.id, wt.name, wt.source, wt.category, wt.path, wt.frame_count,
         wt.frame_size, wt.sample_rate, wt.bit_depth, 1 if wt.is_third_party else 0,
-        wt.contributor, wt.data_b64, wt.sha256, wt.file_size
-    ))
+        wt.contributor, None, wt.sha256, wt.file_size
+    )
 
-def insert_preset(conn: sqlite3.Connection, preset: PresetData):
-    """Insert a preset into the database."""
-    cursor = conn.cursor()
-    cursor.execute('''
-        INSERT OR REPLACE INTO presets
-        (id, name, source, category, path, author, description, tags, oscillators,
-         filters, envelopes, lfos, modulations, effects, master_volume, master_tune,
-         polyphony, portamento, raw_data, sha256, file_size)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+def wavetable_blob_rows(wavetables: List[WavetableData]) -> List[Tuple]:
+    """Sample payloads keyed by the source file's sha256, which determines them."""
+    return [(wt.sha256, wt.data) for wt in wavetables if wt.data is not None]
+
+def get_wavetable_float32(row) -> np.ndarray:
+    """View a wavetable_blobs row's sample BLOB as a float32 array."""
+    return np.frombuffer(row['data'], dtype='<f4')
+
+def preset_row(preset: PresetData) -> Tuple:
+    return (
         preset.id, preset.name, preset.source, preset.category, preset.path,
         preset.author, preset.description, preset.tags, preset.oscillators,
         preset.filters, preset.envelopes, preset.lfos, preset.modulations,
         preset.effects, preset.master_volume, preset.master_tune, preset.polyphony,
         preset.portamento, preset.raw_data, preset.sha256, preset.file_size
-    ))
+    )
+
+def refresh_preset_search(conn: sqlite3.Connection):
+    """Rebuild the preset search tables from the presets table."""
+    with conn:
+        conn.execute('DELETE FROM preset_wavetables')
+        conn.execute('''
+            INSERT INTO preset_wavetables (preset_id, position, wavetable_name, oscillator_index)
+            SELECT p.id, osc.key, json_extract(osc.value, '$.wavetable_name'), json_extract(osc.value, '$.index')
+            FROM presets AS p, json_each(p.oscillators) AS osc
+            WHERE json_valid(p.oscillators)
+              AND json_extract(osc.value, '$.wavetable_name') IS NOT NULL
+        ''')
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'presets_fts'").fetchone():
+            conn.execute("INSERT INTO presets_fts (presets_fts) VALUES ('rebuild')")
+
+def prune_wavetable_blobs(conn: sqlite3.Connection):
+    """Delete sample blobs that no wavetable row points at any more."""
+    with conn:
+        conn.execute('''
+            DELETE FROM wavetable_blobs
+            WHERE sha256 NOT IN (SELECT sha256 FROM wavetables WHERE sha256 IS NOT NULL)
+        ''')
+
+def insert_wavetable(conn: sqlite3.Connection, wt: WavetableData):
+    """Insert a wavetable into the database."""
+    conn.executemany(INSERT_WAVETABLE_BLOB_SQL, wavetable_blob_rows([wt]))
+    conn.execute(INSERT_WAVETABLE_SQL, wavetable_row(wt))
+
+def insert_preset(conn: sqlite3.Connection, preset: PresetData):
+    """Insert a preset into the database."""
+    conn.execute(INSERT_PRESET_SQL, preset_row(preset))
+
+def insert_wavetables(conn: sqlite3.Connection, wavetables: List[WavetableData],
+                      cache: Optional[HttpCache] = None):
+    """Insert wavetables with one executemany, committed as a single transaction.
+    
+    With a cache, the validators kept so far are flushed in the same
+    transaction, so a run that dies part way leaves every stored file
+    marked unchanged for the next run and only the rest are fetched again.
+    """
+    with conn:
+        conn.executemany(INSERT_WAVETABLE_BLOB_SQL, wavetable_blob_rows(wavetables))
+        conn.executemany(INSERT_WAVETABLE_SQL, [wavetable_row(wt) for wt in wavetables])
+        if cache is not None:
+            cache.flush()
+
+def insert_presets(conn: sqlite3.Connection, presets: List[PresetData],
+                   cache: Optional[HttpCache] = None):
+    """Insert presets with one executemany, committed as a single transaction.
+    
+    A cache is flushed in the same transaction, as in insert_wavetables.
+    """
+    with conn:
+        conn.executemany(INSERT_PRESET_SQL, [preset_row(preset) for preset in presets])
+        if cache is not None:
+            cache.flush()
 
 # ============================================================================
 # MAIN DOWNLOAD LOGIC
 # ============================================================================
 
-def download_surge_assets(conn: sqlite3.Connection, output_dir: Path):
+def parse_surge_wavetable_file(data: bytes, name: str, path: str, category: str,
+                               is_third_party: bool = False,
+                               contributor: Optional[str] = None,
+                               data_sha256: Optional[str] = None) -> Optional[WavetableData]:
+    """Parse a Surge .wt or .wav wavetable based on its extension."""
+    if path.endswith('.wt'):
+        return parse_surge_wavetable(data, name, path, category, is_third_party, contributor, data_sha256)
+    return parse_surge_wav_wavetable(data, name, path, category, is_third_party, contributor, data_sha256)
+
+class FileProgress:
+    """Per-file download status: a tqdm bar when available, else a line per file.
+    
+    With the bar, only problem statuses are written out.
+    """
+    
+    def __init__(self, total: int, desc: str):
+        self.bar = tqdm(total=total, desc=desc, unit='file', leave=False) if tqdm is not None else None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        if self.bar is not None:
+            self.bar.close()
+    
+    def report(self, name: str, status: str, problem: bool = False):
+        if self.bar is None:
+            print(f"  Downloading: {name}... {status}")
+            return
+        if problem:
+            self.bar.write(f"  {name}: {status}")
+        self.bar.set_postfix_str(name, refresh=False)
+        self.bar.update(1)
+
+# fetch_and_parse statuses
+FETCH_OK = 'ok'
+FETCH_FAILED = 'failed'
+FETCH_UNCHANGED = 'unchanged'
+
+def parse_pool() -> ProcessPoolExecutor:
+    """Process pool for the parsers.
+    
+    fetch_and_parse submits to it from download threads, and forking a
+    process while other threads run can deadlock the child, so workers
+    come from a fork server (or are spawned where there is none).
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return ProcessPoolExecutor(mp_context=multiprocessing.get_context(method))
+
+def fetch_and_parse(executor: ProcessPoolExecutor, jobs, parse, cache: HttpCache,
+                    hash_data: bool = True):
+    """Download files concurrently and parse them in worker processes.
+
+    Each job is a (label, url, args) tuple and is parsed as parse(data, *args).
+    Up to MAX_CONCURRENT_DOWNLOADS files download at once, each handed to the
+    parser pool as soon as it arrives. With hash_data the file's SHA256 is
+    taken on the download thread and passed to the parser as data_sha256.
+    Files the cache shows are unchanged since they were last parsed are not
+    parsed again. Yields (label, status, result) in job order.
+    """
+    def fetch(url: str, args: Tuple):
+        try:
+            data = download_file(url, cache)
+        except urllib.error.HTTPError:
+            return FETCH_UNCHANGED, None
+        if not data:
+            return FETCH_FAILED, None
+        if hash_data:
+            return FETCH_OK, executor.submit(parse, data, *args, data_sha256=hashlib.sha256(data).hexdigest())
+        return FETCH_OK, executor.submit(parse, data, *args)
+    
+    def finish(label: str, url: str, fetched):
+        status, parsed = fetched.result()
+        result = parsed.result() if parsed else None
+        if result:
+            cache.keep(url)
+        return label, status, result
+    
+    with ThreadPoolExecutor(MAX_CONCURRENT_DOWNLOADS) as downloads:
+        pending = deque()
+        for label, url, args in jobs:
+            pending.append((label, url, downloads.submit(fetch, url, args)))
+            if len(pending) > MAX_CONCURRENT_DOWNLOADS + MAX_PENDING_PARSES:
+                yield finish(*pending.popleft())
+        while pending:
+            yield finish(*pending.popleft())
+
+def download_surge_assets(conn: sqlite3.Connection, output_dir: Path, refresh: bool = False):
     """Download all Surge wavetables and presets."""
     print("\n=== Downloading Surge Assets ===")
     
+    cache = HttpCache(conn, refresh)
+    
     # Wavetable paths
     wt_paths = [
         ('resources/data/wavetables', False),
         ('resources/data/wavetables_3rdparty', True),
     ]
     
+    # Preset paths
+    preset_paths = [
+        'resources/data/patches_factory',
+        'resources/data/patches_3rdparty',
+    ]
+    
+    # One tree listing covers every path in the repo
+    surge_files = list_github_paths(
+        SURGE_REPO, SURGE_BRANCH, [wt_path for wt_path, _ in wt_paths] + preset_paths, cache)
+    
     wavetables_downloaded = 0
+    wavetable_batch = []
     
-    for wt_path, is_third_party in wt_paths:
-        print(f"\nScanning {wt_path}...")
-        
-        try:
-            files = list_github_directory(SURGE_API_BASE, wt_path)
-            wt_files = [f for f in files if f['name'].endswith(('.wt', '.wav'))]
+    with parse_pool() as executor:
+        for wt_path, is_third_party in wt_paths:
+            print(f"\nScanning {wt_path}...")
             
-            print(f"Found {len(wt_files)} wavetable files")
-            
-            for file_info in wt_files:
-                file_path = file_info['path']
-                file_name = file_info['name']
-                download_url = file_info.get('download_url') or f"{SURGE_RAW_BASE}/{file_path}"
-                
-                # Determine category and contributor
-                rel_path = file_path.replace(wt_path + '/', '')
-                parts = rel_path.split('/')
-                
-                if is_third_party and len(parts) >= 2:
-                    contributor = parts[0]
-                    category = '/'.join(parts[:-1])
-                else:
-                    contributor = None
-                    category = '/'.join(parts[:-1]) if len(parts) > 1 else 'root'
+            try:
+                files = surge_files[wt_path]
+                wt_files = [f for f in files if f['name'].endswith(('.wt', '.wav'))]
                 
-                name = file_name.rsplit('.', 1)[0]
+                print(f"Found {len(wt_files)} wavetable files")
                 
-                print(f"  Downloading: {name}...", end=' ', flush=True)
-                
-                data = download_file(download_url)
-                if not data:
-                    print("FAILED")
-                    continue
-                
-                # Parse based on extension
-                if file_name.endswith('.wt'):
-                    wt = parse_surge_wavetable(data, name, file_path, category, is_third_party, contributor)
-                else:
-                    wt = parse_surge_wav_wavetable(data, name, file_path, category, is_third_party, contributor)
-                
-                if wt:
-                    insert_wavetable(conn, wt)
-                    wavetables_downloaded += 1
-                    print(f"OK ({wt.frame_count} frames)")
-                else:
-                    print("PARSE ERROR")
+                jobs = []
+                for file_info in wt_files:
+                    file_path = file_info['path']
+                    file_name = file_info['name']
+                    download_url = file_info.get('download_url') or f"{SURGE_RAW_BASE}/{file_path}"
                     
-        except Exception as e:
-            print(f"Error scanning {wt_path}: {e}")
-    
+                    # Determine category and contributor
+                    rel_path = file_path.replace(wt_path + '/', '')
+                    parts = rel_path.split('/')
+                    
+                    if is_third_party and len(parts) >= 2:
+                        contributor = parts[0]
+                        category = '/'.join(parts[:-1])
+                    else:
+                        contributor = None
+                        category = '/'.join(parts[:-1]) if len(parts) > 1 else 'root'
+                    
+                    name = file_name.rsplit('.', 1)[0]
+                    jobs.append((name, download_url,
+                                 (name, file_path, category, is_third_party, contributor)))
+                
+                with FileProgress(len(jobs), wt_path) as progress:
+                    for name, status, wt in fetch_and_parse(executor, jobs, parse_surge_wavetable_file, cache):
+                        if status == FETCH_FAILED:
+                            progress.report(name, "FAILED", problem=True)
+                        elif status == FETCH_UNCHANGED:
+                            wavetables_downloaded += 1
+                            progress.report(name, "UNCHANGED")
+                        elif wt:
+                            wavetable_batch.append(wt)
+                            if len(wavetable_batch) >= INSERT_BATCH_SIZE:
+                                insert_wavetables(conn, wavetable_batch, cache)
+                                wavetable_batch = []
+                            wavetables_downloaded += 1
+                            progress.report(name, f"OK ({wt.frame_count} frames)")
+                        else:
+                            progress.report(name, "PARSE ERROR", problem=True)
+                        
+            except Exception as e:
+                print(f"Error scanning {wt_path}: {e}")
+    
+    insert_wavetables(conn, wavetable_batch, cache)
     conn.commit()
     print(f"\nTotal Surge wavetables: {wavetables_downloaded}")
     
-    # Preset paths
-    preset_paths = [
-        'resources/data/patches_factory',
-        'resources/data/patches_3rdparty',
-    ]
-    
     presets_downloaded = 0
+    preset_batch = []
     
-    for preset_path in preset_paths:
-        print(f"\nScanning {preset_path}...")
-        
-        try:
-            files = list_github_directory(SURGE_API_BASE, preset_path)
-            fxp_files = [f for f in files if f['name'].endswith('.fxp')]
+    with parse_pool() as executor:
+        for preset_path in preset_paths:
+            print(f"\nScanning {preset_path}...")
             
-            print(f"Found {len(fxp_files)} preset files")
-            
-            for file_info in fxp_files:
-                file_path = file_info['path']
-                file_name = file_info['name']
-                download_url = file_info.get('download_url') or f"{SURGE_RAW_BASE}/{file_path}"
+            try:
+                files = surge_files[preset_path]
+                fxp_files = [f for f in files if f['name'].endswith('.fxp')]
                 
-                print(f"  Downloading: {file_name}...", end=' ', flush=True)
+                print(f"Found {len(fxp_files)} preset files")
                 
-                data = download_file(download_url)
-                if not data:
-                    print("FAILED")
-                    continue
+                jobs = [
+                    (f['name'], f.get('download_url') or f"{SURGE_RAW_BASE}/{f['path']}", (f['path'],))
+                    for f in fxp_files
+                ]
                 
-                preset = parse_surge_fxp_preset(data, file_path)
-                if preset:
-                    insert_preset(conn, preset)
-                    presets_downloaded += 1
-                    print("OK")
-                else:
-                    print("PARSE ERROR")
-                    
-        except Exception as e:
-            print(f"Error scanning {preset_path}: {e}")
-    
+                with FileProgress(len(jobs), preset_path) as progress:
+                    for file_name, status, preset in fetch_and_parse(executor, jobs, parse_surge_fxp_preset, cache, hash_data=False):
+                        if status == FETCH_FAILED:
+                            progress.report(file_name, "FAILED", problem=True)
+                        elif status == FETCH_UNCHANGED:
+                            presets_downloaded += 1
+                            progress.report(file_name, "UNCHANGED")
+                        elif preset:
+                            preset_batch.append(preset)
+                            if len(preset_batch) >= INSERT_BATCH_SIZE:
+                                insert_presets(conn, preset_batch, cache)
+                                preset_batch = []
+                            presets_downloaded += 1
+                            progress.report(file_name, "OK")
+                        else:
+                            progress.report(file_name, "PARSE ERROR", problem=True)
+                        
+            except Exception as e:
+                print(f"Error scanning {preset_path}: {e}")
+    
+    insert_presets(conn, preset_batch, cache)
     conn.commit()
     print(f"\nTotal Surge presets: {presets_downloaded}")
     
     return wavetables_downloaded, presets_downloaded
 
-def download_vital_assets(conn: sqlite3.Connection, output_dir: Path):
+def download_vital_assets(conn: sqlite3.Connection, output_dir: Path, refresh: bool = False):
     """Download Vital factory presets and community presets."""
     print("\n=== Downloading Vital Assets ===")
     
+    cache = HttpCache(conn, refresh)
     presets_downloaded = 0
     wavetables_downloaded = 0
+    preset_batch = []
     
     # Vital factory presets (from main repo)
     vital_preset_paths = [
         'presets',
     ]
+    vital_files_by_path = list_github_paths(VITAL_REPO, VITAL_BRANCH, vital_preset_paths, cache)
     
-    for preset_path in vital_preset_paths:
-        print(f"\nScanning Vital {preset_path}...")
-        
-        try:
-            files = list_github_directory(VITAL_API_BASE, preset_path)
-            vital_files = [f for f in files if f['name'].endswith('.vital')]
-            
-            print(f"Found {len(vital_files)} preset files")
+    with parse_pool() as executor:
+        for preset_path in vital_preset_paths:
+            print(f"\nScanning Vital {preset_path}...")
             
-            for file_info in vital_files:
-                file_path = file_info['path']
-                file_name = file_info['name']
-                download_url = file_info.get('download_url') or f"{VITAL_RAW_BASE}/{file_path}"
+            try:
+                files = vital_files_by_path[preset_path]
+                vital_files = [f for f in files if f['name'].endswith('.vital')]
                 
-                print(f"  Downloading: {file_name}...", end=' ', flush=True)
+                print(f"Found {len(vital_files)} preset files")
                 
-                data = download_file(download_url)
-                if not data:
-                    print("FAILED")
-                    continue
+                jobs = [
+                    (f['name'], f.get('download_url') or f"{VITAL_RAW_BASE}/{f['path']}", (f['path'],))
+                    for f in vital_files
+                ]
                 
-                preset = parse_vital_preset(data, file_path)
-                if preset:
-                    insert_preset(conn, preset)
-                    presets_downloaded += 1
-                    print("OK")
-                else:
-                    print("PARSE ERROR")
-                    
-        except Exception as e:
-            print(f"Error scanning {preset_path}: {e}")
-    
-    # Community presets repo
-    print(f"\nScanning community presets from {VITAL_PRESETS_REPO}...")
-    
-    try:
-        community_api = f"https://api.github.com/repos/{VITAL_PRESETS_REPO}/contents"
-        files = list_github_directory(community_api, '')
-        vital_files = [f for f in files if f['name'].endswith('.vital')]
+                with FileProgress(len(jobs), preset_path) as progress:
+                    for file_name, status, preset in fetch_and_parse(executor, jobs, parse_vital_preset, cache):
+                        if status == FETCH_FAILED:
+                            progress.report(file_name, "FAILED", problem=True)
+                        elif status == FETCH_UNCHANGED:
+                            presets_downloaded += 1
+                            progress.report(file_name, "UNCHANGED")
+                        elif preset:
+                            preset_batch.append(preset)
+                            if len(preset_batch) >= INSERT_BATCH_SIZE:
+                                insert_presets(conn, preset_batch, cache)
+                                preset_batch = []
+                            presets_downloaded += 1
+                            progress.report(file_name, "OK")
+                        else:
+                            progress.report(file_name, "PARSE ERROR", problem=True)
+                        
+            except Exception as e:
+                print(f"Error scanning {preset_path}: {e}")
         
-        print(f"Found {len(vital_files)} community preset files")
+        # Community presets repo
+        print(f"\nScanning community presets from {VITAL_PRESETS_REPO}...")
         
-        for file_info in vital_files:
-            file_path = file_info['path']
-            file_name = file_info['name']
-            download_url = file_info.get('download_url')
-            
-            if not download_url:
-                continue
+        try:
+            files = list_github_paths(VITAL_PRESETS_REPO, VITAL_PRESETS_BRANCH, [''], cache)['']
+            vital_files = [f for f in files if f['name'].endswith('.vital')]
             
-            print(f"  Downloading: {file_name}...", end=' ', flush=True)
+            print(f"Found {len(vital_files)} community preset files")
             
-            data = download_file(download_url)
-            if not data:
-                print("FAILED")
-                continue
+            jobs = [
+                (f['name'], f['download_url'], (f"community/{f['path']}",))
+                for f in vital_files if f.get('download_url')
+            ]
             
-            preset = parse_vital_preset(data, f"community/{file_path}")
-            if preset:
-                insert_preset(conn, preset)
-                presets_downloaded += 1
-                print("OK")
-            else:
-                print("PARSE ERROR")
-                
-    except Exception as e:
-        print(f"Error scanning community presets: {e}")
+            with FileProgress(len(jobs), 'community') as progress:
+                for file_name, status, preset in fetch_and_parse(executor, jobs, parse_vital_preset, cache):
+                    if status == FETCH_FAILED:
+                        progress.report(file_name, "FAILED", problem=True)
+                    elif status == FETCH_UNCHANGED:
+                        presets_downloaded += 1
+                        progress.report(file_name, "UNCHANGED")
+                    elif preset:
+                        preset_batch.append(preset)
+                        if len(preset_batch) >= INSERT_BATCH_SIZE:
+                            insert_presets(conn, preset_batch, cache)
+                            preset_batch = []
+                        presets_downloaded += 1
+                        progress.report(file_name, "OK")
+                    else:
+                        progress.report(file_name, "PARSE ERROR", problem=True)
+                    
+        except Exception as e:
+            print(f"Error scanning community presets: {e}")
     
+    insert_presets(conn, preset_batch, cache)
     conn.commit()
     print(f"\nTotal Vital presets: {presets_downloaded}")
     print(f"Total Vital wavetables: {wavetables_downloaded}")
@@ -1214,8 +1866,8 @@ export interface WavetableRecord {
   bit_depth: number;
   is_third_party: boolean;
   contributor: string | null;
-  /** Base64-encoded Float32Array of all samples */
-  data_b64: string | null;
+  /** Inline samples from older databases; see getWavetableData */
+  data: Buffer | null;
   sha256: string | null;
   file_size: number;
   created_at: string;
@@ -1323,9 +1975,16 @@ export interface PresetRecord {
 
 export class SynthAssetDatabase {
   private db: sqlite3.Database;
+  /** Parsed presets by id; the database is opened read-only, so entries never go stale */
+  private presetCache = new Map<string, PresetRecord>();
+  /** Whether the database was built with the presets_fts search index */
+  private hasPresetFts: boolean;
   
   constructor(dbPath: string) {
     this.db = new sqlite3(dbPath, { readonly: true });
+    this.hasPresetFts = this.db.prepare(
+      "SELECT 1 FROM sqlite_master WHERE name = 'presets_fts'"
+    ).get() !== undefined;
   }
   
   close(): void {
@@ -1355,16 +2014,16 @@ export class SynthAssetDatabase {
   }
   
   getWavetableCategories(): string[] {
-    const rows = this.db.prepare('SELECT DISTINCT category FROM wavetables ORDER BY category').all() as { category: string }[];
-    return rows.map(r => r.category);
+    return this.db.prepare('SELECT DISTINCT category FROM wavetables ORDER BY category').pluck().all() as string[];
   }
   
   getWavetableData(id: string): Float32Array | null {
-    const wt = this.getWavetableById(id);
-    if (!wt?.data_b64) return null;
-    
-    const buffer = Buffer.from(wt.data_b64, 'base64');
-    return new Float32Array(buffer.buffer, buffer.byteOffset, buffer.byteLength / 4);
+    const data = this.db.prepare(`
+      SELECT b.data FROM wavetables AS w
+      JOIN wavetable_blobs AS b ON b.sha256 = w.sha256
+      WHERE w.id = ?
+    `).pluck().get(id) as Buffer | undefined;
+    return data ? decodeWavetableData(data) : null;
   }
   
   // Preset queries
@@ -1375,6 +2034,9 @@ export class SynthAssetDatabase {
   }
   
   getPresetById(id: string): PresetRecord | undefined {
+    const cached = this.presetCache.get(id);
+    if (cached) return cached;
+    
     const row = this.db.prepare('SELECT * FROM presets WHERE id = ?').get(id);
     return row ? this.parsePresetRow(row) : undefined;
   }
@@ -1395,25 +2057,31 @@ export class SynthAssetDatabase {
   }
   
   searchPresets(query: string): PresetRecord[] {
-    const rows = this.db.prepare('SELECT * FROM presets WHERE name LIKE ? OR category LIKE ? OR author LIKE ? ORDER BY name')
-      .all(`%${query}%`, `%${query}%`, `%${query}%`) as any[];
+    // presets_fts is trigram-tokenized, so these LIKE patterns are index lookups
+    const sql = this.hasPresetFts
+      ? `SELECT * FROM presets WHERE rowid IN (
+           SELECT rowid FROM presets_fts WHERE name LIKE ? OR category LIKE ? OR author LIKE ?
+         ) ORDER BY name`
+      : 'SELECT * FROM presets WHERE name LIKE ? OR category LIKE ? OR author LIKE ? ORDER BY name';
+    const rows = this.db.prepare(sql).all(`%${query}%`, `%${query}%`, `%${query}%`) as any[];
     return rows.map(this.parsePresetRow);
   }
   
   getPresetCategories(): string[] {
-    const rows = this.db.prepare('SELECT DISTINCT category FROM presets ORDER BY category').all() as { category: string }[];
-    return rows.map(r => r.category);
+    return this.db.prepare('SELECT DISTINCT category FROM presets ORDER BY category').pluck().all() as string[];
   }
   
   getPresetAuthors(): string[] {
-    const rows = this.db.prepare('SELECT DISTINCT author FROM presets WHERE author IS NOT NULL ORDER BY author').all() as { author: string }[];
-    return rows.map(r => r.author);
+    return this.db.prepare('SELECT DISTINCT author FROM presets WHERE author IS NOT NULL ORDER BY author').pluck().all() as string[];
   }
   
   // Find presets using a specific wavetable
   getPresetsUsingWavetable(wavetableName: string): PresetRecord[] {
-    const rows = this.db.prepare('SELECT * FROM presets WHERE oscillators LIKE ? ORDER BY name')
-      .all(`%"wavetable_name":"${wavetableName}"%`) as any[];
+    const rows = this.db.prepare(`
+      SELECT * FROM presets WHERE id IN (
+        SELECT preset_id FROM preset_wavetables WHERE wavetable_name = ?
+      ) ORDER BY name
+    `).all(wavetableName) as any[];
     return rows.map(this.parsePresetRow);
   }
   
@@ -1430,8 +2098,12 @@ export class SynthAssetDatabase {
     return { wavetables, presets, surgeWavetables, vitalWavetables, surgePresets, vitalPresets };
   }
   
-  private parsePresetRow(row: any): PresetRecord {
-    return {
+  // Arrow field so rows.map(this.parsePresetRow) keeps `this`
+  private parsePresetRow = (row: any): PresetRecord => {
+    const cached = this.presetCache.get(row.id);
+    if (cached) return cached;
+    
+    const preset: PresetRecord = {
       ...row,
       is_third_party: Boolean(row.is_third_party),
       tags: JSON.parse(row.tags || '[]'),
@@ -1442,7 +2114,9 @@ export class SynthAssetDatabase {
       modulations: JSON.parse(row.modulations || '[]'),
       effects: JSON.parse(row.effects || '[]'),
     };
-  }
+    this.presetCache.set(row.id, preset);
+    return preset;
+  };
 }
 
 // ============================================================================
@@ -1450,19 +2124,30 @@ export class SynthAssetDatabase {
 // ============================================================================
 
 /**
- * Decode base64 wavetable data to Float32Array.
+ * View a wavetable sample BLOB as a Float32Array.
+ *
+ * A BLOB starting on a 4-byte boundary, as better-sqlite3 returns them, is
+ * viewed in place without copying; a misaligned one is copied once into a
+ * fresh buffer, since typed-array views need aligned offsets.
  */
-export function decodeWavetableData(data_b64: string): Float32Array {
-  const buffer = Buffer.from(data_b64, 'base64');
-  return new Float32Array(buffer.buffer, buffer.byteOffset, buffer.byteLength / 4);
+export function decodeWavetableData(data: Buffer): Float32Array {
+  const offset = data.byteOffset;
+  if ((offset & 3) === 0) {
+    return new Float32Array(data.buffer, offset, data.byteLength >> 2);
+  }
+  const aligned = new ArrayBuffer(data.byteLength);
+  new Uint8Array(aligned).set(data);
+  return new Float32Array(aligned, 0, data.byteLength >> 2);
 }
 
 /**
  * Extract a single frame from wavetable data.
+ *
+ * Returns a view into `data`; call `.slice()` on it before modifying.
  */
 export function extractWavetableFrame(data: Float32Array, frameIndex: number, frameSize: number): Float32Array {
   const start = frameIndex * frameSize;
-  return data.slice(start, start + frameSize);
+  return data.subarray(start, start + frameSize);
 }
 
 /**
@@ -1482,9 +2167,11 @@ export function interpolateWavetableFrame(
   const f0 = extractWavetableFrame(data, frame0, frameSize);
   const f1 = extractWavetableFrame(data, frame1, frameSize);
   
+  const a = 1 - frac;
+  const b = frac;
   const result = new Float32Array(frameSize);
   for (let i = 0; i < frameSize; i++) {
-    result[i] = f0[i]! * (1 - frac) + f1[i]! * frac;
+    result[i] = f0[i]! * a + f1[i]! * b;
   }
   
   return result;
@@ -1501,6 +2188,8 @@ def main():
     parser.add_argument('--ts-output', type=str, default='./synth-asset-db.ts', help='TypeScript output path')
     parser.add_argument('--surge-only', action='store_true', help='Only download Surge assets')
     parser.add_argument('--vital-only', action='store_true', help='Only download Vital assets')
+    parser.add_argument('--refresh', action='store_true',
+                        help='Download and parse every file again instead of skipping unchanged ones')
     
     args = parser.parse_args()
     
@@ -1525,15 +2214,18 @@ def main():
     
     try:
         if not args.vital_only:
-            surge_wt, surge_presets = download_surge_assets(conn, output_dir)
+            surge_wt, surge_presets = download_surge_assets(conn, output_dir, args.refresh)
             total_wt += surge_wt
             total_presets += surge_presets
         
         if not args.surge_only:
-            vital_wt, vital_presets = download_vital_assets(conn, output_dir)
+            vital_wt, vital_presets = download_vital_assets(conn, output_dir, args.refresh)
             total_wt += vital_wt
             total_presets += vital_presets
         
+        refresh_preset_search(conn)
+        prune_wavetable_blobs(conn)
+        
         # Store metadata
         cursor = conn.cursor()
         cursor.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)', 
@@ -1545,6 +2237,9 @@ def main():
         cursor.execute('INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)',
                       ('total_presets', str(total_presets)))
         conn.commit()
+        # WAL is only needed while writing; switch back so the finished
+        # database is a single file for the TypeScript side to open
+        conn.execute('PRAGMA journal_mode=DELETE')
         
     finally:
         conn.close()
@@ -22,6 +22,7 @@ import {
   FilterType,
   LFOShape
 } from './unified-preset';
+import { decodeWavetableData } from './synth-asset-db';
 
 // =============================================================================
 // DATABASE TYPES
@@ -177,8 +178,9 @@ export class InstrumentDatabase {
       ORDER BY oscillator_index
     `);
     
+    // SELECT * so databases built before sample_scale existed still prepare
     this.stmtGetWavetableData = this.db.prepare(`
-      SELECT data_b64 FROM wavetables WHERE id = ?
+      SELECT * FROM wavetables WHERE id = ?
     `);
   }
   
@@ -244,15 +246,14 @@ export class InstrumentDatabase {
     }
     
     const row = this.stmtGetWavetableData.get(id) as any;
-    if (!row?.data_b64) return null;
+    const samples = row?.data ?? row?.data_b64;
+    if (!samples) return null;
     
     const info = this.getWavetableById(id);
     if (!info) return null;
     
-    // Decode base64 to Float32Array
-    const buffer = Buffer.from(row.data_b64, 'base64');
-    const totalSamples = info.frameCount * info.frameSize;
-    const float32 = new Float32Array(buffer.buffer, buffer.byteOffset, totalSamples);
+    // Decode the base64 or BLOB samples to Float32Array
+    const float32 = decodeWavetableData(samples, row.sample_scale);
     
     // Split into frames
     const frames: Float32Array[] = [];
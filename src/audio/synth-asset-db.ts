@@ -28,8 +28,14 @@ export interface WavetableRecord {
   bit_depth: number;
   is_third_party: number; // SQLite stores as 0/1
   contributor: string | null;
-  /** Base64-encoded Float32Array of all samples */
+  /** Base64-encoded samples: Float32Array, or Int16Array when sample_scale is set */
   data_b64: string | null;
+  /** Multiplier from int16 samples to floats; null for float32 data */
+  sample_scale?: number | null;
+  /** Raw float32 samples, stored instead of data_b64 by newer databases */
+  data?: Buffer | null;
+  /** Raw float32 samples from wavetable_blobs, shared by wavetables with the same sha256 */
+  blob_data?: Buffer | null;
   sha256: string | null;
   file_size: number;
   created_at: string;
@@ -277,22 +283,31 @@ export class SynthAssetDatabase {
   constructor(dbPath: string, options?: { readonly?: boolean }) {
     this.db = new Database(dbPath, { readonly: options?.readonly ?? true });
     
+    // Newer databases store each distinct sample payload once in wavetable_blobs
+    const hasBlobs = this.db.prepare(
+      "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'wavetable_blobs'"
+    ).get() !== undefined;
+    const wavetables = hasBlobs
+      ? '(SELECT w.*, b.data AS blob_data FROM wavetables AS w '
+        + 'LEFT JOIN wavetable_blobs AS b ON b.sha256 = w.sha256) AS wavetables'
+      : 'wavetables';
+    
     // Prepare all statements for better performance
     this.statements = {
       getAllWavetables: this.db.prepare(
-        'SELECT * FROM wavetables ORDER BY source, category, name'
+        `SELECT * FROM ${wavetables} ORDER BY source, category, name`
       ),
       getWavetableById: this.db.prepare(
-        'SELECT * FROM wavetables WHERE id = ?'
+        `SELECT * FROM ${wavetables} WHERE id = ?`
       ),
       getWavetablesBySource: this.db.prepare(
-        'SELECT * FROM wavetables WHERE source = ? ORDER BY category, name'
+        `SELECT * FROM ${wavetables} WHERE source = ? ORDER BY category, name`
       ),
       getWavetablesByCategory: this.db.prepare(
-        'SELECT * FROM wavetables WHERE category = ? ORDER BY name'
+        `SELECT * FROM ${wavetables} WHERE category = ? ORDER BY name`
       ),
       searchWavetables: this.db.prepare(
-        'SELECT * FROM wavetables WHERE name LIKE ? OR category LIKE ? ORDER BY name'
+        `SELECT * FROM ${wavetables} WHERE name LIKE ? OR category LIKE ? ORDER BY name`
       ),
       getWavetableCategories: this.db.prepare(
         'SELECT DISTINCT category FROM wavetables ORDER BY category'
@@ -408,8 +423,9 @@ export class SynthAssetDatabase {
    */
   getWavetableData(id: string): Float32Array | null {
     const wt = this.getWavetableById(id);
-    if (!wt?.data_b64) return null;
-    return decodeWavetableData(wt.data_b64);
+    const samples = wt?.blob_data ?? wt?.data ?? wt?.data_b64;
+    if (!wt || !samples) return null;
+    return decodeWavetableData(samples, wt.sample_scale);
   }
   
   /**
@@ -573,11 +589,34 @@ export class SynthAssetDatabase {
 // ============================================================================
 
 /**
- * Decode base64 wavetable data to Float32Array.
+ * Decode wavetable data to Float32Array.
+ *
+ * Accepts either a base64 string or a raw sample BLOB. When `sampleScale`
+ * is given the payload holds int16 samples, which are promoted to floats
+ * here; otherwise it is raw float32, returned as a view over the payload
+ * unless its offset is misaligned for one, in which case it is copied.
+ */
+export function decodeWavetableData(data: string | Buffer, sampleScale?: number | null): Float32Array {
+  const buffer = typeof data === 'string' ? Buffer.from(data, 'base64') : data;
+  if (sampleScale == null) {
+    const bytes = alignBytes(buffer, 4);
+    return new Float32Array(bytes.buffer, bytes.byteOffset, bytes.byteLength >> 2);
+  }
+  const bytes = alignBytes(buffer, 2);
+  const pcm = new Int16Array(bytes.buffer, bytes.byteOffset, bytes.byteLength >> 1);
+  const samples = new Float32Array(pcm.length);
+  for (let i = 0; i < pcm.length; i++) {
+    samples[i] = pcm[i]! * sampleScale;
+  }
+  return samples;
+}
+
+/**
+ * Return `bytes` itself if it starts on a multiple of `alignment`, or an
+ * aligned copy otherwise (typed-array views need aligned offsets).
  */
-export function decodeWavetableData(data_b64: string): Float32Array {
-  const buffer = Buffer.from(data_b64, 'base64');
-  return new Float32Array(buffer.buffer, buffer.byteOffset, buffer.byteLength / 4);
+function alignBytes(bytes: Uint8Array, alignment: number): Uint8Array {
+  return bytes.byteOffset % alignment === 0 ? bytes : new Uint8Array(bytes);
 }
 
 /**
@@ -624,6 +663,7 @@ export function parseWavetableRecord(
   record: WavetableRecord,
   includeData = true
 ): ParsedWavetable {
+  const samples = record.blob_data ?? record.data ?? record.data_b64;
   return {
     id: record.id,
     name: record.name,
@@ -636,7 +676,9 @@ export function parseWavetableRecord(
     bitDepth: record.bit_depth,
     isThirdParty: Boolean(record.is_third_party),
     contributor: record.contributor,
-    data: includeData && record.data_b64 ? decodeWavetableData(record.data_b64) : null,
+    data: includeData && samples
+      ? decodeWavetableData(samples, record.sample_scale)
+      : null,
     sha256: record.sha256,
     fileSize: record.file_size,
   };
@@ -3,11 +3,7 @@
 Update currentsteps-branchA.md to mark Phase F tasks as complete
 """
 
-import re
-
-# Read the file
-with open('currentsteps-branchA.md', 'r') as f:
-    content = f.read()
+from roadmap_utils import mark_tasks_done, patch_roadmap
 
 # Phase F updates - Notation Board
 updates_notation = [
@@ -107,19 +103,7 @@ updates_session = [
 
 all_updates = updates_notation + updates_tracker + updates_sampler + updates_session
 
-for task_id, _ in all_updates:
-    # Replace - [ ] FXXX with - [x] FXXX ✅
-    pattern = f'- \\[ \\] {task_id} '
-    replacement = f'- [x] {task_id} '
-    content = re.sub(pattern, replacement, content)
-    
-    # Add ✅ at end of line if not already there
-    pattern = f'(- \\[x\\] {task_id} .+?)(\\.)?$'
-    replacement = r'\1. ✅'
-    content = re.sub(pattern, replacement, content, flags=re.MULTILINE)
-
-# Write back
-with open('currentsteps-branchA.md', 'w') as f:
-    f.write(content)
+# Check off each task and mark it ✅ in a single pass over the file
+patch_roadmap('currentsteps-branchA.md', mark_tasks_done(task_id for task_id, _ in all_updates))
 
 print("Updated Phase F tasks in currentsteps-branchA.md")
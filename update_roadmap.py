@@ -3,56 +3,44 @@
 
 import re
 
-with open('currentsteps-branchC.md', 'r') as f:
-    content = f.read()
-
-# Mark C084
-content = re.sub(
-    r'- \[ \] C084 Add support for .soft constraints',
-    '- [x] C084 Add support for "soft constraints"',
-    content
-)
-content = re.sub(
-    r'\(requirements\)\.\n',
-    '(requirements). *(hard field in music-spec.ts)*\n',
-    content,
-    count=1
-)
-
-# Mark C085
-content = re.sub(
-    r'- \[ \] C085 Add Prolog predicate `preference/2`',
-    '- [x] C085 Add Prolog predicate `preference/2`',
-    content
-)
-# Mark C086
-content = re.sub(
-    r'- \[ \] C086 Add .weight',
-    '- [x] C086 Add "weight"',
-    content
-)
-content = re.sub(
-    r'scoring aggregator\.\n',
-    'scoring aggregator. *(weight in music-spec.ts)*\n',
-    content,
-    count=1
-)
-
-# Mark C089
-content = re.sub(
-    r'- \[ \] C089 Add .constraint pack',
-    '- [x] C089 Add "constraint pack"',
-    content
-)
-
-# Mark C090
-content = re.sub(
-    r'- \[ \] C090 Add Prolog predicate `constraint_pack/2` mapping pack id to constraints list\.',
-    '- [x] C090 Add Prolog predicate `constraint_pack/2` mapping pack id to constraints list. *(In music-spec.pl)*',
-    content
-)
-
-with open('currentsteps-branchC.md', 'w') as f:
-    f.write(content)
+from roadmap_utils import patch_roadmap
+
+# (name, pattern, replacement, count) in file order; count 0 replaces every match
+ROADMAP_UPDATES = [
+    # Mark C084
+    ('c084', r'- \[ \] C084 Add support for .soft constraints',
+     '- [x] C084 Add support for "soft constraints"', 0),
+    ('c084_note', r'\(requirements\)\.\n',
+     '(requirements). *(hard field in music-spec.ts)*\n', 1),
+    # Mark C085
+    ('c085', r'- \[ \] C085 Add Prolog predicate `preference/2`',
+     '- [x] C085 Add Prolog predicate `preference/2`', 0),
+    # Mark C086
+    ('c086', r'- \[ \] C086 Add .weight',
+     '- [x] C086 Add "weight"', 0),
+    ('c086_note', r'scoring aggregator\.\n',
+     'scoring aggregator. *(weight in music-spec.ts)*\n', 1),
+    # Mark C089
+    ('c089', r'- \[ \] C089 Add .constraint pack',
+     '- [x] C089 Add "constraint pack"', 0),
+    # Mark C090
+    ('c090', r'- \[ \] C090 Add Prolog predicate `constraint_pack/2` mapping pack id to constraints list\.',
+     '- [x] C090 Add Prolog predicate `constraint_pack/2` mapping pack id to constraints list. *(In music-spec.pl)*', 0),
+]
+
+# Every update in one alternation, so each line is scanned once
+ROADMAP_PATTERN = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern, _, _ in ROADMAP_UPDATES))
+REPLACEMENTS = {name: (replacement, count) for name, _, replacement, count in ROADMAP_UPDATES}
+
+replaced = dict.fromkeys(REPLACEMENTS, 0)
+
+def dispatch(match: re.Match) -> str:
+    replacement, count = REPLACEMENTS[match.lastgroup]
+    if count and replaced[match.lastgroup] >= count:
+        return match.group()
+    replaced[match.lastgroup] += 1
+    return replacement
+
+patch_roadmap('currentsteps-branchC.md', lambda line: ROADMAP_PATTERN.sub(dispatch, line))
 
 print('Done updating roadmap items.')